@@ -0,0 +1,175 @@
+"""Banc d'essai des performances de idh.py : génération, événements, rendu et export.
+
+    python3 bench_idh.py                          # mesure et affiche
+    python3 bench_idh.py --save-baseline base.json
+    python3 bench_idh.py --baseline base.json     # échoue si un cas régresse au-delà du seuil
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import idh
+
+# Tailles étudiées : nombre de territoires, horizon (années), nombre de répliques
+TERRITORY_COUNTS = [1, 4, len(idh.TERRITOIRES)]
+HORIZONS = [24, 100]
+REPLICATE_COUNTS = [100, 1000, 10000]
+
+# Régression tolérée par rapport à la référence (0.25 = 25 % plus lent ou plus gourmand) ;
+# les écarts inférieurs aux planchers absolus (secondes, Mo) relèvent du bruit de mesure
+DEFAULT_THRESHOLD = 0.25
+NOISE_FLOOR = 0.001
+MEMORY_NOISE_FLOOR = 1.0
+
+# Mesures comparées à la référence : clé du rapport -> (plancher absolu, unité affichée, facteur)
+COMPARED_METRICS = {
+    'secondes': (NOISE_FLOOR, 'ms', 1000),
+    'pic_memoire_mo': (MEMORY_NOISE_FLOOR, 'Mo', 1),
+}
+
+def _quiet(func):
+    """Exécute `func` sans les messages de progression du module"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func()
+
+def measure(func, repeat=5):
+    """Temps médian de `func` sur `repeat` exécutions, puis pic mémoire d'une exécution supplémentaire"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _quiet(func)
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    _quiet(func)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return statistics.median(durations), peak
+
+def benchmark_cases(output_dir, quick=False, render=True):
+    """Cas mesurés : nom -> (fonction, nombre de lignes produites) ; les fichiers vont dans `output_dir`"""
+    cases = {}
+
+    for n_territories in TERRITORY_COUNTS:
+        for horizon in HORIZONS:
+            territories = idh.TERRITOIRES[:n_territories]
+            end_year = 2002 + horizon - 1
+
+            def generate(territories=territories, end_year=end_year):
+                for territoire in territories:
+                    idh.DromcomDemographyAnalyzer(territoire, 2002, end_year, seed=0).generate_demographic_data()
+
+            cases[f'generation/{n_territories}t/{horizon}a'] = (generate, n_territories * horizon)
+            cases[f'panel/{n_territories}t/{horizon}a'] = (
+                lambda territories=territories, end_year=end_year:
+                    idh.generate_panel(territories, 2002, end_year, seed=0),
+                n_territories * horizon)
+
+    # Chaque simulateur de colonne de base, sur un long horizon
+    analyzer = idh.DromcomDemographyAnalyzer('La Réunion', 2002, 2101, seed=0)
+    years = np.arange(2002, 2102)
+    for column, (requires, method) in idh.COLUMN_GRAPH.items():
+        if not requires:
+            cases[f'simulation/{method}'] = (lambda method=method: getattr(analyzer, method)(years), len(years))
+
+    panel = _quiet(lambda: idh.generate_panel(end_year=2101, seed=0))
+    cases['evenements/_add_territory_trends'] = (lambda: analyzer._add_territory_trends(panel.copy()), len(panel))
+
+    for n_replicates in REPLICATE_COUNTS[:2] if quick else REPLICATE_COUNTS:
+        cases[f'ensemble/{n_replicates}r'] = (
+            lambda n=n_replicates: analyzer.generate_ensemble(n, chunk_size=min(n, 10000)), n_replicates * len(years))
+
+    df = _quiet(lambda: idh.DromcomDemographyAnalyzer('La Réunion', seed=0).generate_demographic_data())
+    cases['export/csv'] = (lambda: analyzer.export_data(panel, output_dir, 'csv'), len(panel))
+
+    if render:
+        renderer = idh.DromcomDemographyAnalyzer('La Réunion', seed=0)
+        cases['rendu/create_demographic_analysis'] = (
+            lambda: renderer.create_demographic_analysis(df, output_dir=output_dir, show=False,
+                                                        dpi=100, insights=False), len(df))
+
+    return cases
+
+def run(quick=False, render=True, repeat=5):
+    """Mesure tous les cas ; retourne le rapport (durée, débit, pic mémoire)"""
+    results = {}
+    # Les exports et rendus mesurés sont supprimés à la fin du banc d'essai
+    with tempfile.TemporaryDirectory(prefix='bench_idh_') as output_dir:
+        for name, (func, rows) in benchmark_cases(output_dir, quick, render).items():
+            seconds, peak = measure(func, 1 if name.startswith('rendu') else repeat)
+            throughput = rows / seconds if seconds else None
+            results[name] = {'secondes': seconds, 'lignes_par_seconde': throughput,
+                             'pic_memoire_mo': peak / 1024 ** 2}
+            rate = f"{throughput:>14,.0f}" if throughput is not None else f"{'-':>14}"
+            print(f"{name:<44}{seconds * 1000:>10.2f} ms{rate} l/s{peak / 1024 ** 2:>9.1f} Mo")
+
+    budget = idh.check_import_budget()
+    results['import'] = {'secondes': budget['seconds'], 'lignes_par_seconde': None, 'pic_memoire_mo': None}
+    print(f"{'import':<44}{budget['seconds'] * 1000:>10.2f} ms"
+          f"{'' if budget['ok'] else '  ⚠️ budget dépassé'}")
+
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'machine': platform.machine(), 'resultats': results}
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Retourne les cas plus lents ou plus gourmands en mémoire que la référence au-delà du seuil"""
+    regressions = []
+    for name, result in report['resultats'].items():
+        reference = baseline['resultats'].get(name)
+        if reference is None:
+            continue
+        for metric, (floor, _, _) in COMPARED_METRICS.items():
+            before, after = reference.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            if ratio > 1 + threshold and after - before > floor:
+                regressions.append((name, metric, before, after, ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai des performances de idh.py")
+    parser.add_argument('--baseline', help="référence JSON à comparer (échec en cas de régression)")
+    parser.add_argument('--save-baseline', help="enregistrer les mesures comme nouvelle référence")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="régression tolérée (0.25 = 25 %% plus lent)")
+    parser.add_argument('--repeat', type=int, default=5, help="nombre d'exécutions par cas")
+    parser.add_argument('--quick', action='store_true', help="omettre les plus grands ensembles")
+    parser.add_argument('--no-render', action='store_true', help="omettre le rendu des graphiques")
+    args = parser.parse_args(argv)
+
+    print("⏱️ BANC D'ESSAI IDH DROM-COM")
+    print("=" * 80)
+    report = run(args.quick, not args.no_render, args.repeat)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Référence enregistrée: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} régression(s) au-delà de {args.threshold:.0%}:")
+            for name, metric, before, after, ratio in regressions:
+                _, unit, scale = COMPARED_METRICS[metric]
+                print(f"• {name} ({metric}): {before * scale:.2f} {unit} -> {after * scale:.2f} {unit} (x{ratio:.2f})")
+            return 1
+        print(f"\n✅ Aucune régression au-delà de {args.threshold:.0%} par rapport à {args.baseline}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,591 +1,2068 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta
+from functools import lru_cache
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import re
+import subprocess
+import sys
+import time
 import warnings
+import zlib
 warnings.filterwarnings('ignore')
 
+# Configuration spécifique à chaque DROM-COM : valeurs de base et pentes
+# annuelles des tendances utilisées par les simulateurs
+TERRITOIRE_CONFIGS = {
+    "Guadeloupe": {
+        "population_base": 390000,
+        "natalite_base": 12.5,
+        "mortalite_base": 7.2,
+        "idh_base": 0.82,
+        "croissance_population": 0.012,
+        "tendance_naissances": -0.004,
+        "tendance_deces": 0.008,
+        "tendance_natalite": -0.008,
+        "tendance_mortalite": 0.006,
+        "tendance_idh": 0.006,
+        "esperance_vie_base": 78.5,
+        "solde_migratoire_base": 800,
+        "tendance_migration": -0.015,
+        "part_jeunes_base": 0.28,
+        "tendance_jeunes": -0.01,
+        "part_seniors_base": 0.25,
+        "tendance_seniors": 0.012,
+        "chomage_base": 0.18,
+        "tendance_chomage": -0.004,
+        "pib_base": 22.0,
+        "tendance_pib": 0.012,
+        "specialites": ["tourisme", "agriculture", "services"]
+    },
+    "Martinique": {
+        "population_base": 375000,
+        "natalite_base": 11.8,
+        "mortalite_base": 7.5,
+        "idh_base": 0.84,
+        "croissance_population": 0.012,
+        "tendance_naissances": -0.004,
+        "tendance_deces": 0.008,
+        "tendance_natalite": -0.008,
+        "tendance_mortalite": 0.006,
+        "tendance_idh": 0.004,
+        "esperance_vie_base": 78.5,
+        "solde_migratoire_base": 800,
+        "tendance_migration": -0.015,
+        "part_jeunes_base": 0.28,
+        "tendance_jeunes": -0.01,
+        "part_seniors_base": 0.25,
+        "tendance_seniors": 0.012,
+        "chomage_base": 0.18,
+        "tendance_chomage": -0.004,
+        "pib_base": 22.0,
+        "tendance_pib": 0.012,
+        "specialites": ["tourisme", "banane", "rhum", "services"]
+    },
+    "Guyane": {
+        "population_base": 290000,
+        "natalite_base": 25.4,
+        "mortalite_base": 4.8,
+        "idh_base": 0.76,
+        "croissance_population": 0.028,
+        "tendance_naissances": -0.002,
+        "tendance_deces": 0.004,
+        "tendance_natalite": -0.01,
+        "tendance_mortalite": 0.003,
+        "tendance_idh": 0.008,
+        "esperance_vie_base": 76.3,
+        "solde_migratoire_base": 2000,
+        "tendance_migration": -0.02,
+        "part_jeunes_base": 0.45,
+        "tendance_jeunes": -0.008,
+        "part_seniors_base": 0.08,
+        "tendance_seniors": 0.01,
+        "chomage_base": 0.22,
+        "tendance_chomage": -0.005,
+        "pib_base": 15.5,
+        "tendance_pib": 0.022,
+        "specialites": ["spatial", "or", "biodiversite", "foret"]
+    },
+    "La Réunion": {
+        "population_base": 860000,
+        "natalite_base": 15.2,
+        "mortalite_base": 6.3,
+        "idh_base": 0.8,
+        "croissance_population": 0.012,
+        "tendance_naissances": -0.004,
+        "tendance_deces": 0.006,
+        "tendance_natalite": -0.008,
+        "tendance_mortalite": 0.005,
+        "tendance_idh": 0.006,
+        "esperance_vie_base": 78.5,
+        "solde_migratoire_base": 800,
+        "tendance_migration": -0.015,
+        "part_jeunes_base": 0.32,
+        "tendance_jeunes": -0.009,
+        "part_seniors_base": 0.18,
+        "tendance_seniors": 0.011,
+        "chomage_base": 0.12,
+        "tendance_chomage": -0.003,
+        "pib_base": 18.0,
+        "tendance_pib": 0.015,
+        "specialites": ["tourisme", "canne", "services", "numerique"]
+    },
+    "Mayotte": {
+        "population_base": 280000,
+        "natalite_base": 35.7,
+        "mortalite_base": 4.2,
+        "idh_base": 0.69,
+        "croissance_population": 0.035,
+        "tendance_naissances": -0.003,
+        "tendance_deces": 0.004,
+        "tendance_natalite": -0.015,
+        "tendance_mortalite": 0.003,
+        "tendance_idh": 0.008,
+        "esperance_vie_base": 75.8,
+        "solde_migratoire_base": 2000,
+        "tendance_migration": -0.02,
+        "part_jeunes_base": 0.55,
+        "tendance_jeunes": -0.008,
+        "part_seniors_base": 0.08,
+        "tendance_seniors": 0.01,
+        "chomage_base": 0.22,
+        "tendance_chomage": -0.005,
+        "pib_base": 8.5,
+        "tendance_pib": 0.022,
+        "specialites": ["agriculture", "peche", "jeunesse"]
+    },
+    "Saint-Martin": {
+        "population_base": 35000,
+        "natalite_base": 14.3,
+        "mortalite_base": 5.8,
+        "idh_base": 0.78,
+        "croissance_population": 0.018,
+        "tendance_naissances": -0.005,
+        "tendance_deces": 0.006,
+        "tendance_natalite": -0.012,
+        "tendance_mortalite": 0.005,
+        "tendance_idh": 0.006,
+        "esperance_vie_base": 79.2,
+        "solde_migratoire_base": 500,
+        "tendance_migration": -0.01,
+        "part_jeunes_base": 0.32,
+        "tendance_jeunes": -0.009,
+        "part_seniors_base": 0.18,
+        "tendance_seniors": 0.011,
+        "chomage_base": 0.12,
+        "tendance_chomage": -0.003,
+        "pib_base": 18.0,
+        "tendance_pib": 0.015,
+        "specialites": ["tourisme", "commerce", "plages"]
+    },
+    "Saint-Barthélemy": {
+        "population_base": 9800,
+        "natalite_base": 9.8,
+        "mortalite_base": 6.2,
+        "idh_base": 0.88,
+        "croissance_population": 0.018,
+        "tendance_naissances": -0.005,
+        "tendance_deces": 0.006,
+        "tendance_natalite": -0.012,
+        "tendance_mortalite": 0.005,
+        "tendance_idh": 0.004,
+        "esperance_vie_base": 79.2,
+        "solde_migratoire_base": 500,
+        "tendance_migration": -0.01,
+        "part_jeunes_base": 0.32,
+        "tendance_jeunes": -0.009,
+        "part_seniors_base": 0.18,
+        "tendance_seniors": 0.011,
+        "chomage_base": 0.08,
+        "tendance_chomage": -0.003,
+        "pib_base": 35.0,
+        "tendance_pib": 0.015,
+        "specialites": ["luxe", "tourisme", "plages"]
+    },
+    "Saint-Pierre-et-Miquelon": {
+        "population_base": 6000,
+        "natalite_base": 8.5,
+        "mortalite_base": 9.1,
+        "idh_base": 0.83,
+        "croissance_population": -0.003,
+        "tendance_naissances": -0.004,
+        "tendance_deces": 0.01,
+        "tendance_natalite": -0.008,
+        "tendance_mortalite": 0.008,
+        "tendance_idh": 0.006,
+        "esperance_vie_base": 77.6,
+        "solde_migratoire_base": -100,
+        "tendance_migration": -0.005,
+        "part_jeunes_base": 0.22,
+        "tendance_jeunes": -0.009,
+        "part_seniors_base": 0.28,
+        "tendance_seniors": 0.015,
+        "chomage_base": 0.12,
+        "tendance_chomage": -0.003,
+        "pib_base": 18.0,
+        "tendance_pib": 0.015,
+        "specialites": ["peche", "tourisme", "froid"]
+    },
+    "Wallis-et-Futuna": {
+        "population_base": 11500,
+        "natalite_base": 16.2,
+        "mortalite_base": 5.4,
+        "idh_base": 0.79,
+        "croissance_population": 0.012,
+        "tendance_naissances": -0.004,
+        "tendance_deces": 0.006,
+        "tendance_natalite": -0.008,
+        "tendance_mortalite": 0.005,
+        "tendance_idh": 0.006,
+        "esperance_vie_base": 77.0,
+        "solde_migratoire_base": 800,
+        "tendance_migration": -0.015,
+        "part_jeunes_base": 0.32,
+        "tendance_jeunes": -0.009,
+        "part_seniors_base": 0.18,
+        "tendance_seniors": 0.011,
+        "chomage_base": 0.12,
+        "tendance_chomage": -0.003,
+        "pib_base": 18.0,
+        "tendance_pib": 0.015,
+        "specialites": ["traditions", "peche", "agriculture"]
+    },
+    "Polynésie française": {
+        "population_base": 280000,
+        "natalite_base": 14.8,
+        "mortalite_base": 5.6,
+        "idh_base": 0.81,
+        "croissance_population": 0.012,
+        "tendance_naissances": -0.004,
+        "tendance_deces": 0.006,
+        "tendance_natalite": -0.008,
+        "tendance_mortalite": 0.005,
+        "tendance_idh": 0.006,
+        "esperance_vie_base": 77.0,
+        "solde_migratoire_base": 800,
+        "tendance_migration": -0.015,
+        "part_jeunes_base": 0.32,
+        "tendance_jeunes": -0.009,
+        "part_seniors_base": 0.18,
+        "tendance_seniors": 0.011,
+        "chomage_base": 0.12,
+        "tendance_chomage": -0.003,
+        "pib_base": 18.0,
+        "tendance_pib": 0.015,
+        "specialites": ["tourisme", "perliculture", "peche"]
+    },
+    "Nouvelle-Calédonie": {
+        "population_base": 270000,
+        "natalite_base": 15.3,
+        "mortalite_base": 5.9,
+        "idh_base": 0.83,
+        "croissance_population": 0.012,
+        "tendance_naissances": -0.004,
+        "tendance_deces": 0.006,
+        "tendance_natalite": -0.008,
+        "tendance_mortalite": 0.005,
+        "tendance_idh": 0.006,
+        "esperance_vie_base": 77.0,
+        "solde_migratoire_base": 800,
+        "tendance_migration": -0.015,
+        "part_jeunes_base": 0.32,
+        "tendance_jeunes": -0.009,
+        "part_seniors_base": 0.18,
+        "tendance_seniors": 0.011,
+        "chomage_base": 0.12,
+        "tendance_chomage": -0.003,
+        "pib_base": 28.5,
+        "tendance_pib": 0.018,
+        "specialites": ["nickel", "tourisme", "biodiversite"]
+    },
+    # Configuration par défaut
+    "default": {
+        "population_base": 100000,
+        "natalite_base": 12.0,
+        "mortalite_base": 7.0,
+        "idh_base": 0.75,
+        "croissance_population": 0.012,
+        "tendance_naissances": -0.004,
+        "tendance_deces": 0.006,
+        "tendance_natalite": -0.008,
+        "tendance_mortalite": 0.005,
+        "tendance_idh": 0.006,
+        "esperance_vie_base": 77.0,
+        "solde_migratoire_base": 800,
+        "tendance_migration": -0.015,
+        "part_jeunes_base": 0.32,
+        "tendance_jeunes": -0.009,
+        "part_seniors_base": 0.18,
+        "tendance_seniors": 0.011,
+        "chomage_base": 0.12,
+        "tendance_chomage": -0.003,
+        "pib_base": 18.0,
+        "tendance_pib": 0.015,
+        "specialites": ["services", "tourisme"]
+    }
+}
+
+# Liste des DROM-COM
+TERRITOIRES = [name for name in TERRITOIRE_CONFIGS if name != "default"]
+
+# Événements marquants appliqués aux séries simulées : (territoires concernés,
+# ou None pour tous, première année, dernière année ou None si l'effet perdure,
+# colonne, multiplicateur). Une borne peut être précisée au mois : (année, mois)
+TERRITOIRE_EVENEMENTS = [
+    # Crise financière mondiale
+    (None, 2008, 2009, 'Taux_Chomage', 1.12),
+    (None, 2008, 2009, 'PIB_Par_Habitant', 0.96),
+    # Pandémie COVID-19
+    (None, 2020, 2021, 'Taux_Mortalite', 1.08),
+    (None, 2020, 2021, 'PIB_Par_Habitant', 0.92),
+    (None, 2020, 2021, 'Taux_Chomage', 1.15),
+    # Départementalisation de Mayotte
+    (["Mayotte"], 2011, None, 'IDH', 1.01),
+    (["Mayotte"], 2011, None, 'PIB_Par_Habitant', 1.02),
+    # Mouvements sociaux en Guyane
+    (["Guyane"], 2017, 2018, 'PIB_Par_Habitant', 0.97),
+    (["Guyane"], 2017, 2018, 'Taux_Chomage', 1.08),
+    # Référendums et incertitudes politiques en Nouvelle-Calédonie
+    (["Nouvelle-Calédonie"], 2018, 2018, 'Solde_Migratoire', 0.8),
+    (["Nouvelle-Calédonie"], 2018, 2018, 'PIB_Par_Habitant', 0.98),
+    (["Nouvelle-Calédonie"], 2020, 2021, 'Solde_Migratoire', 0.8),
+    (["Nouvelle-Calédonie"], 2020, 2021, 'PIB_Par_Habitant', 0.98),
+    # Développement du numérique à La Réunion
+    (["La Réunion"], 2010, None, 'IDH', 1.005),
+    (["La Réunion"], 2010, None, 'PIB_Par_Habitant', 1.01),
+]
+
+# Résolutions temporelles : nombre de périodes par an
+FREQUENCIES = {'Y': 1, 'Q': 4, 'M': 12}
+
+# Flux (effectifs sur la période), répartis entre les périodes de l'année
+FLOW_COLUMNS = ['Naissances', 'Deces', 'Solde_Migratoire']
+
+# Saisonnalité mensuelle des séries infra-annuelles (janvier à décembre, moyenne 1) :
+# (multiplicateurs, spécialité requise ou None pour tous les territoires).
+# Le chômage baisse pendant la haute saison touristique (décembre à avril)
+SAISONNALITE = {
+    'Naissances': ([0.97, 0.91, 0.97, 0.95, 0.99, 0.98, 1.02, 1.03, 1.07, 1.06, 1.01, 1.04], None),
+    'Taux_Chomage': ([0.95, 0.94, 0.95, 0.97, 1.02, 1.05, 1.03, 1.02, 1.06, 1.05, 1.01, 0.95], 'tourisme'),
+}
+
+# Statistiques des insights, calculées en une seule agrégation :
+# clé -> (colonne, agrégation, échelle)
+INSIGHT_STATISTICS = {
+    'population_moyenne': ('Population', 'mean', 1),
+    'population_initiale': ('Population', 'first', 1),
+    'population_finale': ('Population', 'last', 1),
+    'taux_natalite_moyen': ('Taux_Natalite', 'mean', 1),
+    'taux_mortalite_moyen': ('Taux_Mortalite', 'mean', 1),
+    'idh_moyen': ('IDH', 'mean', 1),
+    'solde_naturel_moyen': ('Solde_Naturel', 'mean', 1),
+    'solde_migratoire_moyen': ('Solde_Migratoire', 'mean', 1),
+    'part_moins_20_ans': ('Part_Moins_20_Ans', 'mean', 100),
+    'part_20_60_ans': ('Part_20_60_Ans', 'mean', 100),
+    'part_plus_60_ans': ('Part_Plus_60_Ans', 'mean', 100),
+    'esperance_vie_moyenne': ('Esperance_Vie', 'mean', 1),
+    'taux_chomage_moyen': ('Taux_Chomage', 'mean', 100),
+    'pib_par_habitant_moyen': ('PIB_Par_Habitant', 'mean', 1),
+}
+
+# Recommandations stratégiques : (règle sur les insights, recommandations)
+RECOMMANDATIONS = [
+    # Population très jeune
+    (lambda s: (s.part_moins_20_ans or 0) > 40, [
+        "Investir massivement dans l'éducation et la formation",
+        "Développer des politiques d'emploi pour les jeunes",
+        "Créer des infrastructures adaptées à une population jeune"]),
+    # Population vieillissante
+    (lambda s: (s.part_plus_60_ans or 0) > 25, [
+        "Adapter le système de santé au vieillissement",
+        "Développer les services aux personnes âgées",
+        "Favoriser le maintien à domicile"]),
+    # Chômage élevé
+    (lambda s: (s.taux_chomage_moyen or 0) > 15, [
+        "Développer des programmes de formation professionnelle",
+        "Soutenir la création d'entreprises et l'entrepreneuriat",
+        "Diversifier l'économie pour créer des emplois"]),
+    # Défis spécifiques
+    (lambda s: s.territoire in ["Mayotte", "Guyane"], [
+        "Améliorer l'accès aux services de base",
+        "Développer les infrastructures de transport",
+        "Lutter contre l'habitat informel"]),
+    (lambda s: "tourisme" in s.specialites, [
+        "Développer un tourisme durable et responsable",
+        "Valoriser le patrimoine culturel et naturel",
+        "Former les professionnels du tourisme"]),
+]
+
+# Panneaux du tableau de bord : (méthode de tracé, colonnes requises, bandes d'ensemble) ;
+# un panneau dont une colonne manque (source officielle partielle) est laissé vide
+DASHBOARD_PANELS = [
+    ('_plot_population_evolution', ['Population', 'Taux_Croissance'], True),
+    ('_plot_birth_death_rates', ['Taux_Natalite', 'Taux_Mortalite'], True),
+    ('_plot_age_structure', ['Part_Moins_20_Ans', 'Part_Plus_60_Ans', 'Part_20_60_Ans'], True),
+    ('_plot_hdi_evolution', ['IDH'], True),
+    ('_plot_balances', ['Solde_Naturel', 'Solde_Migratoire'], False),
+    ('_plot_life_expectancy', ['Esperance_Vie'], True),
+    ('_plot_economic_indicators', ['PIB_Par_Habitant', 'Taux_Chomage'], True),
+    ('_plot_demographic_projection', ['Population', 'Part_Moins_20_Ans', 'Part_20_60_Ans',
+                                      'Part_Plus_60_Ans'], False),
+]
+
+# Codes géographiques officiels (INSEE/ISEE) des territoires
+CODES_TERRITOIRES = {
+    '971': 'Guadeloupe', '972': 'Martinique', '973': 'Guyane', '974': 'La Réunion',
+    '975': 'Saint-Pierre-et-Miquelon', '976': 'Mayotte', '977': 'Saint-Barthélemy',
+    '978': 'Saint-Martin', '986': 'Wallis-et-Futuna', '987': 'Polynésie française',
+    '988': 'Nouvelle-Calédonie',
+}
+
+# Intitulés reconnus dans les fichiers officiels (normalisés : minuscules, sans
+# accents ni ponctuation) pour chaque colonne du schéma ; 'Indicateur' et
+# 'Valeur' servent aux fichiers au format long (une ligne par indicateur)
+SOURCE_COLUMNS = {
+    'Territoire': ['territoire', 'departement', 'collectivite', 'libelle geographique', 'libgeo',
+                   'geo', 'codgeo', 'code geographique', 'zone', 'region', 'dep'],
+    'Annee': ['annee', 'an', 'year', 'periode', 'time period', 'date'],
+    'Indicateur': ['indicateur', 'indicator', 'variable', 'serie', 'libelle serie'],
+    'Valeur': ['valeur', 'value', 'obs value', 'observation'],
+    'Population': ['population', 'population municipale', 'population totale', 'pop',
+                   'population au 1er janvier', 'population en milieu d annee'],
+    'Naissances': ['naissances', 'nombre de naissances', 'naissances vivantes', 'naiss'],
+    'Deces': ['deces', 'nombre de deces', 'dece'],
+    'Taux_Natalite': ['taux de natalite', 'taux natalite', 'natalite'],
+    'Taux_Mortalite': ['taux de mortalite', 'taux mortalite', 'mortalite'],
+    'IDH': ['idh', 'indice de developpement humain'],
+    'Esperance_Vie': ['esperance de vie', 'esperance de vie a la naissance', 'esperance vie'],
+    'Solde_Migratoire': ['solde migratoire', 'solde apparent des entrees sorties', 'migrations nettes'],
+    'Part_Moins_20_Ans': ['part des moins de 20 ans', 'moins de 20 ans', 'part moins 20 ans'],
+    'Part_Plus_60_Ans': ['part des 60 ans et plus', '60 ans et plus', 'part des plus de 60 ans',
+                         'part plus 60 ans'],
+    'Taux_Chomage': ['taux de chomage', 'taux chomage', 'chomage'],
+    'PIB_Par_Habitant': ['pib par habitant', 'pib habitant', 'produit interieur brut par habitant'],
+}
+
+# Colonnes exprimées en fraction dans le schéma (les sources les donnent souvent en %)
+FRACTION_COLUMNS = ['Part_Moins_20_Ans', 'Part_Plus_60_Ans', 'Part_20_60_Ans', 'Taux_Chomage']
+
+# Formats d'export des jeux de données et des graphiques
+EXPORT_FORMATS = ['csv', 'xlsx', 'json', 'parquet', 'feather', 'npz']
+COLUMNAR_FORMATS = ['parquet', 'feather', 'npz']
+RENDER_FORMATS = ['png', 'svg', 'webp']
+
+# Compressions des formats texte (CSV, JSON) : le suffixe est ajouté au nom du fichier,
+# ce qui permet à pandas de décompresser à la relecture
+TEXT_COMPRESSIONS = {'gzip': '.gz', 'bz2': '.bz2', 'zip': '.zip', 'xz': '.xz', 'zstd': '.zst'}
+
+# Budget du temps d'import du module pour les usages sans graphique (secondes),
+# vérifié par check_import_budget() : matplotlib n'est chargé qu'au premier tracé
+IMPORT_TIME_BUDGET = 1.0
+
+# Mémoire des trajectoires complètes (répliques × années, float64) conservées par passe
+# pour calculer des quantiles d'ensemble exacts ; au-delà, les colonnes sont réparties
+# sur plusieurs passes de simulation
+ENSEMBLE_MEMORY_BUDGET = 256 * 1024 ** 2
+
+# Graphe de génération des colonnes : colonne -> (colonnes requises, méthode).
+# Les colonnes de base n'ont aucune dépendance et sont simulées une seule fois ;
+# les colonnes dérivées sont calculées sur les colonnes déjà construites.
+# L'ordre du dictionnaire est celui des colonnes du jeu de données
+COLUMN_GRAPH = {
+    'Population': ([], '_simulate_population'),
+    'Taux_Croissance': (['Population'], '_derive_growth_rate'),
+    'Naissances': ([], '_simulate_births'),
+    'Deces': ([], '_simulate_deaths'),
+    'Taux_Natalite': ([], '_simulate_birth_rate'),
+    'Taux_Mortalite': ([], '_simulate_death_rate'),
+    'Solde_Naturel': (['Naissances', 'Deces'], '_derive_natural_balance'),
+    'IDH': ([], '_simulate_hdi'),
+    'Esperance_Vie': ([], '_simulate_life_expectancy'),
+    'Solde_Migratoire': ([], '_simulate_migration_balance'),
+    'Part_Moins_20_Ans': ([], '_simulate_young_population'),
+    'Part_Plus_60_Ans': ([], '_simulate_elderly_population'),
+    'Part_20_60_Ans': (['Part_Moins_20_Ans', 'Part_Plus_60_Ans'], '_derive_working_age_share'),
+    'Taux_Chomage': ([], '_simulate_unemployment'),
+    'PIB_Par_Habitant': ([], '_simulate_gdp_per_capita'),
+}
+
+# Modèles de projection : séries tendancielles indépendantes, ou projection
+# par composantes (cohortes annuelles d'âge, matrices de Leslie)
+PROJECTION_MODELS = ['tendance', 'cohortes']
+AGE_MAX = 100  # dernier groupe ouvert : 100 ans et plus
+TAUX_DEPART_MAX = 0.02  # part maximale d'une cohorte qui émigre dans l'année
+
+# Colonnes produites par le modèle par composantes (les autres restent tendancielles)
+COHORT_COLUMNS = ['Population', 'Naissances', 'Deces', 'Taux_Natalite', 'Taux_Mortalite',
+                  'Part_Moins_20_Ans', 'Part_Plus_60_Ans']
+
+# Paramètres du profil utilisés par les matrices de Leslie
+COHORT_PARAMETERS = ['population_base', 'natalite_base', 'mortalite_base', 'tendance_natalite',
+                     'part_jeunes_base', 'part_seniors_base']
+
+# Types de stockage compacts (voir DemographicArrays) : années en int16,
+# effectifs en entiers 32 bits, taux, parts et indices en float32
+COLUMN_DTYPES = {
+    'Annee': np.int16,
+    'Population': np.int32,
+    'Naissances': np.int32,
+    'Deces': np.int32,
+    'Solde_Naturel': np.int32,
+    'Solde_Migratoire': np.int32,
+}
+DEFAULT_COLUMN_DTYPE = np.float32
+
+# Paramètres numériques compilés dans chaque profil de territoire
+PROFILE_FIELDS = [key for key in TERRITOIRE_CONFIGS["default"] if key != "specialites"]
+
+class TerritoryProfile(namedtuple('TerritoryProfile', ['territoire', 'specialites'] + PROFILE_FIELDS)):
+    """Profil immuable d'un territoire, résolu une seule fois depuis TERRITOIRE_CONFIGS"""
+    __slots__ = ()
+    
+    @classmethod
+    def for_territory(cls, territoire):
+        """Compile le profil d'un territoire (valeurs par défaut pour les paramètres absents)"""
+        config = dict(TERRITOIRE_CONFIGS["default"], **TERRITOIRE_CONFIGS.get(territoire, {}))
+        return cls.from_config(territoire, config)
+    
+    @classmethod
+    def from_config(cls, territoire, config):
+        """Compile un profil à partir d'une entrée de configuration"""
+        return cls(territoire, tuple(config["specialites"]),
+                   *(float(config[key]) for key in PROFILE_FIELDS))
+    
+    @classmethod
+    def stack(cls, profiles):
+        """Empile plusieurs profils : chaque paramètre devient une colonne (profils × 1)"""
+        return cls(np.array([p.territoire for p in profiles])[:, None],
+                   tuple(p.specialites for p in profiles),
+                   *(np.array([getattr(p, key) for p in profiles], dtype=float)[:, None]
+                     for key in PROFILE_FIELDS))
+    
+    def broadcast(self, size):
+        """Répète le profil sur `size` lignes (répliques d'un ensemble)"""
+        return self._replace(**{key: np.full((size, 1), getattr(self, key)) for key in PROFILE_FIELDS})
+
+class DemographicInsights(namedtuple('DemographicInsights',
+                                     ['territoire', 'debut', 'fin', 'specialites'] + list(INSIGHT_STATISTICS) +
+                                     ['croissance_population', 'recommandations'])):
+    """Insights d'un territoire ; une statistique vaut None si sa colonne est absente du jeu de données"""
+    __slots__ = ()
+    
+    def to_dict(self):
+        return dict(self._asdict(), specialites=list(self.specialites))
+
+def _annualize(df):
+    """Ramène une série infra-annuelle (colonne Mois) à des valeurs annuelles : flux sommés,
+    population du début d'année, taux et parts moyennés"""
+    keys = ['Territoire', 'Annee'] if 'Territoire' in df.columns else ['Annee']
+    flows = FLOW_COLUMNS + ['Solde_Naturel']
+    how = {col: 'sum' if col in flows else 'first' if col == 'Population' else 'mean'
+           for col in df.columns if col not in keys and col != 'Mois'}
+    return df.groupby(keys, sort=False, observed=True).agg(how).reset_index()
+
+def compute_insights(df, territoire=None):
+    """Calcule les insights en une seule agrégation : un DemographicInsights pour un territoire,
+    un dictionnaire par territoire pour un panel, par quantile pour un ensemble"""
+    # Ensemble : les colonnes <indicateur>_p<q> sont résumées quantile par quantile
+    suffixes = sorted({col.rsplit('_', 1)[1] for col in df.columns
+                       if col.rsplit('_', 1)[0] in COLUMN_GRAPH and col.rsplit('_', 1)[-1].startswith('p')},
+                      key=lambda suffix: float(suffix[1:]))
+    if suffixes:
+        return {suffix: compute_insights(df[['Annee'] + [col for col in df.columns if col.endswith(f'_{suffix}')]]
+                                         .rename(columns=lambda col: col[:-len(suffix) - 1] if col != 'Annee' else col),
+                                         territoire)
+                for suffix in suffixes}
+    
+    if 'Mois' in df.columns:
+        # Les statistiques sont annuelles (« personnes/an ») : les flux des périodes sont cumulés
+        df = _annualize(df)
+    
+    aggregations = {key: (column, how) for key, (column, how, _) in INSIGHT_STATISTICS.items()
+                    if column in df.columns}
+    aggregations.update(debut=('Annee', 'min'), fin=('Annee', 'max'))
+    if 'Territoire' in df.columns:
+        table = df.groupby('Territoire', sort=False, observed=True).agg(**aggregations)
+    else:
+        table = df.groupby(np.zeros(len(df), dtype=np.int8)).agg(**aggregations)
+        table.index = [territoire]
+    
+    insights = {}
+    for name, row in zip(table.index, table.to_dict('records')):
+        values = {key: row[key] * INSIGHT_STATISTICS[key][2] if key in row else None
+                  for key in INSIGHT_STATISTICS}
+        if values['population_initiale'] is not None:
+            values['croissance_population'] = (values['population_finale'] / values['population_initiale'] - 1) * 100
+        else:
+            values['croissance_population'] = None
+        
+        record = DemographicInsights(territoire=name, debut=int(row['debut']), fin=int(row['fin']),
+                                     specialites=TerritoryProfile.for_territory(name).specialites,
+                                     recommandations=[], **values)
+        for rule, recommandations in RECOMMANDATIONS:
+            if rule(record):
+                record.recommandations.extend(recommandations)
+        insights[name] = record
+    
+    return insights if 'Territoire' in df.columns else insights[territoire]
+
+def _format_insight(value, spec):
+    """Formate une statistique des insights ; « n.d. » si l'indicateur manque aux données"""
+    if value is None or pd.isna(value):
+        return 'n.d.'
+    return format(value, spec)
+
+def insights_to_json(insights, path=None, indent=2):
+    """Sérialise des insights (éventuellement imbriqués) en JSON ; écrit `path` si fourni"""
+    def convert(value):
+        if isinstance(value, DemographicInsights):
+            return convert(value.to_dict())
+        if isinstance(value, dict):
+            return {str(key): convert(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [convert(item) for item in value]
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+    
+    text = json.dumps(convert(insights), ensure_ascii=False, indent=indent)
+    if path is not None:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return text
+
+def _available_panels(df):
+    """Disponibilité de chaque panneau du tableau de bord selon les colonnes des données"""
+    return tuple(all(col in df.columns for col in required) for _, required, _ in DASHBOARD_PANELS)
+
+def _dashboard_style():
+    """Style des graphiques ; matplotlib n'est importé qu'au premier tracé"""
+    import matplotlib.style
+    return matplotlib.style.context('seaborn-v0_8')
+
+def _new_figure(interactive):
+    """Crée la figure du tableau de bord : gérée par pyplot si elle est affichée, autonome sinon"""
+    if interactive:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=(20, 24))
+    
+    from matplotlib.figure import Figure
+    return Figure(figsize=(20, 24))
+
+def check_import_budget(budget=IMPORT_TIME_BUDGET, runs=3):
+    """Mesure dans un interpréteur neuf le temps d'import du module (médiane de `runs` essais)"""
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    code = (f"import sys, time; start = time.perf_counter(); import {module}; "
+            f"print(time.perf_counter() - start, 'matplotlib' in sys.modules)")
+    
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout.split()
+        timings.append(float(output[0]))
+        matplotlib_loaded = output[1] == 'True'
+    
+    seconds = float(np.median(timings))
+    return {'seconds': seconds, 'budget': budget, 'matplotlib_loaded': matplotlib_loaded,
+            'ok': seconds <= budget and not matplotlib_loaded}
+
+def check_cohort_accounting(start_year=2002, end_year=2100, seed=0, tolerance=1e-6):
+    """Vérifie sur tous les territoires que le modèle par cohortes respecte l'équation
+    démographique (ΔPopulation = Naissances - Décès + Solde migratoire), sans valeur
+    manquante ni territoire vidé"""
+    panel = generate_panel(start_year=start_year, end_year=end_year, seed=seed, model='cohortes')
+    
+    failures = {}
+    for territoire, df in panel.groupby('Territoire', sort=False):
+        population = df['Population'].to_numpy()
+        flows = (df['Naissances'] - df['Deces'] + df['Solde_Migratoire']).to_numpy()
+        gap = float(np.max(np.abs(np.diff(population) - flows[:-1]) / population[:-1]))
+        # Le taux de croissance de la première année est indéfini par construction
+        missing = int(df.drop(columns='Taux_Croissance').isna().sum().sum() +
+                      df['Taux_Croissance'].iloc[1:].isna().sum())
+        if gap > tolerance or missing or population.min() < 1:
+            failures[territoire] = {'ecart_relatif': gap, 'valeurs_manquantes': missing,
+                                    'population_min': float(population.min())}
+    return {'territoires': panel['Territoire'].nunique(), 'echecs': failures, 'ok': not failures}
+
+@lru_cache(maxsize=None)
+def _age_schedules():
+    """Profils par âge du modèle par composantes : mortalité, fécondité, migrations (formes normalisées)"""
+    ages = np.arange(AGE_MAX + 1)
+    # Mortalité infantile décroissante puis loi de Gompertz aux âges adultes
+    mortality = 0.005 * np.exp(-1.5 * ages) + 0.00005 * np.exp(0.095 * ages)
+    # Fécondité en cloche entre 15 et 49 ans, centrée sur 29 ans
+    fertility = np.where((ages >= 15) & (ages <= 49), np.exp(-0.5 * ((ages - 29) / 6) ** 2), 0)
+    # Migrants concentrés chez les jeunes adultes
+    migration = np.exp(-0.5 * ((ages - 25) / 10) ** 2)
+    return ages, mortality, fertility / fertility.sum(), migration / migration.sum()
+
+def _initial_pyramid(part_jeunes, part_seniors):
+    """Répartition initiale par âge respectant les parts des moins de 20 ans et des 60 ans et plus"""
+    ages, mortality, _, _ = _age_schedules()
+    survival = np.exp(-np.cumsum(mortality))
+    bands = [(ages < 20, part_jeunes), ((ages >= 20) & (ages < 60), 1 - part_jeunes - part_seniors),
+             (ages >= 60, part_seniors)]
+    
+    pyramid = 0
+    for band, share in bands:
+        shape = np.where(band, survival, 0)
+        pyramid = pyramid + share[..., None] * shape / shape.sum()
+    return pyramid
+
+def _time_points(start_year, end_year, freq='Y'):
+    """Instants de la période (années fractionnaires), avec l'année et le mois de début de chaque période"""
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Fréquence inconnue: {freq} (disponibles: {', '.join(FREQUENCIES)})")
+    
+    periods = FREQUENCIES[freq]
+    steps = np.arange((end_year - start_year + 1) * periods)
+    years = start_year + steps // periods
+    months = 1 + (steps % periods) * (12 // periods)
+    return years + (months - 1) / 12, years, months
+
+def _event_bound(bound, end=False):
+    """Convertit une borne d'événement (année ou (année, mois)) en instant ; une borne de fin est exclusive"""
+    year, month = bound if isinstance(bound, tuple) else (bound, 12 if end else 1)
+    return year + (month - (not end)) / 12
+
+def _typed_frame(df, float32=False):
+    """Types compacts pour l'export : années en int16, territoires en catégories, flottants en float32 si demandé"""
+    typed = {}
+    for col in df.columns:
+        values = df[col]
+        if col == 'Annee':
+            values = values.astype('int16')
+        elif col == 'Mois':
+            values = values.astype('int8')
+        elif col == 'Territoire':
+            values = values.astype('category')
+        elif float32 and values.dtype == np.float64:
+            values = values.astype('float32')
+        typed[col] = values.to_numpy() if col != 'Territoire' else values.array
+    typed = pd.DataFrame(typed)
+    # L'état de simulation (voir extend) accompagne les données dans les métadonnées
+    typed.attrs = df.attrs.copy()
+    return typed
+
+def _require_pyarrow(fmt):
+    """Vérifie la présence de pyarrow, nécessaire aux formats Parquet et Feather"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(f"Le format {fmt} nécessite pyarrow (pip install pyarrow)") from None
+
+def _frame_format(path):
+    """Format d'un fichier exporté, sans le suffixe de compression des formats texte"""
+    base, ext = os.path.splitext(path)
+    if ext in TEXT_COMPRESSIONS.values():
+        ext = os.path.splitext(base)[1]
+    return ext.lstrip('.')
+
+def write_frame(df, path, fmt=None, compression=None, float32=False):
+    """Écrit un DataFrame et retourne son chemin ; les formats colonnaires conservent des types
+    compacts, les formats texte compressés reçoivent le suffixe de la compression (.csv.gz, ...)"""
+    fmt = fmt or _frame_format(path)
+    if fmt in COLUMNAR_FORMATS:
+        df = _typed_frame(df, float32)
+    elif compression is not None:
+        if fmt not in ('csv', 'json') or compression not in TEXT_COMPRESSIONS:
+            raise ValueError(f"Compression {compression} non prise en charge pour le format {fmt} "
+                             f"(formats texte: {', '.join(TEXT_COMPRESSIONS)})")
+        if not path.endswith(TEXT_COMPRESSIONS[compression]):
+            path += TEXT_COMPRESSIONS[compression]
+    options = {} if compression is None else {'compression': compression}
+    
+    if fmt == 'csv':
+        df.to_csv(path, index=False, **options)
+    elif fmt == 'xlsx':
+        df.to_excel(path, index=False)
+    elif fmt == 'json':
+        df.to_json(path, orient='records', force_ascii=False, **options)
+    elif fmt == 'parquet':
+        _require_pyarrow(fmt)
+        df.to_parquet(path, index=False, **options)
+    elif fmt == 'feather':
+        _require_pyarrow(fmt)
+        df.to_feather(path, **options)
+    elif fmt == 'npz':
+        arrays = {col: df[col].to_numpy(dtype=str) if col == 'Territoire' else df[col].to_numpy()
+                  for col in df.columns}
+        if df.attrs:
+            arrays['__attrs__'] = np.array(json.dumps(df.attrs))
+        (np.savez_compressed if compression else np.savez)(path, **arrays)
+    else:
+        raise ValueError(f"Format d'export inconnu: {fmt}")
+    
+    return path
+
+def read_frame(path):
+    """Relit un fichier exporté, ou un dossier de partitions écrit par PartitionedWriter"""
+    if os.path.isdir(path):
+        frames = []
+        for entry in sorted(os.scandir(path), key=lambda e: e.name):
+            if entry.is_dir() and entry.name.startswith('Territoire='):
+                territoire = entry.name.split('=', 1)[1]
+                for part in sorted(os.listdir(entry.path)):
+                    df = read_frame(os.path.join(entry.path, part))
+                    df.insert(0, 'Territoire', territoire)
+                    frames.append(df)
+        return pd.concat(frames, ignore_index=True)
+    
+    fmt = _frame_format(path)
+    if fmt == 'csv':
+        return pd.read_csv(path)
+    if fmt == 'xlsx':
+        return pd.read_excel(path)
+    if fmt == 'json':
+        return pd.read_json(path, orient='records')
+    if fmt == 'parquet':
+        _require_pyarrow(fmt)
+        return pd.read_parquet(path)
+    if fmt == 'feather':
+        _require_pyarrow(fmt)
+        return pd.read_feather(path)
+    if fmt == 'npz':
+        with np.load(path) as arrays:
+            df = pd.DataFrame({col: arrays[col] for col in arrays.files if col != '__attrs__'})
+            if '__attrs__' in arrays.files:
+                df.attrs = json.loads(arrays['__attrs__'].item())
+            return df
+    raise ValueError(f"Format d'export inconnu: {fmt}")
+
+def _normalize_label(label):
+    """Intitulé en minuscules, sans accents ni ponctuation"""
+    import unicodedata
+    text = unicodedata.normalize('NFKD', str(label)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text.lower()).split())
+
+@lru_cache(maxsize=None)
+def _source_aliases():
+    """Table intitulé normalisé -> colonne du schéma"""
+    aliases = {}
+    for column, labels in SOURCE_COLUMNS.items():
+        for label in [column] + labels:
+            aliases.setdefault(_normalize_label(label), column)
+    return aliases
+
+@lru_cache(maxsize=None)
+def _territory_aliases():
+    """Table nom ou code normalisé -> nom du territoire"""
+    aliases = {_normalize_label(name): name for name in TERRITOIRES}
+    aliases.update({code: name for code, name in CODES_TERRITOIRES.items()})
+    return aliases
+
+def _map_columns(header, mapping=None):
+    """Associe les intitulés d'un fichier aux colonnes du schéma (`mapping` est prioritaire)"""
+    mapping = mapping or {}
+    renames, targets = {}, set()
+    for label in header:
+        target = mapping.get(label) or _source_aliases().get(_normalize_label(label))
+        if target is not None and target not in targets:
+            renames[label] = target
+            targets.add(target)
+    return renames
+
+def _is_header(row, mapping=None):
+    """Une ligne est l'en-tête si elle désigne l'année et au moins un indicateur"""
+    targets = set(_map_columns([cell for cell in row if cell is not None], mapping).values())
+    return 'Annee' in targets and len(targets - {'Territoire', 'Annee'}) > 0
+
+def _clean_source_chunk(chunk):
+    """Convertit un bloc lu au schéma : années entières, territoires reconnus, nombres décimaux"""
+    if 'Annee' in chunk.columns:
+        years = pd.to_numeric(chunk['Annee'], errors='coerce')
+        if years.isna().any():
+            # Dates ou périodes (2020-01-01, 2020T1...) : l'année est extraite
+            years = years.fillna(pd.to_numeric(chunk['Annee'].astype(str).str.extract(r'(\d{4})')[0],
+                                               errors='coerce'))
+        chunk['Annee'] = years
+    
+    if 'Territoire' in chunk.columns:
+        labels = chunk['Territoire'].astype(str).str.strip()
+        known = {label: _territory_aliases().get(_normalize_label(label), label) for label in labels.unique()}
+        chunk['Territoire'] = labels.map(known)
+    
+    for col in chunk.columns:
+        if col not in ('Territoire', 'Annee', 'Indicateur') and not pd.api.types.is_numeric_dtype(chunk[col]):
+            # Décimales à la française et séparateurs de milliers
+            text = chunk[col].astype(str).str.replace('[\\s\u00a0\u202f]', '', regex=True)
+            chunk[col] = pd.to_numeric(text.str.replace(',', '.', regex=False), errors='coerce')
+    
+    return chunk
+
+def _read_source_chunks(path, mapping=None, sheet_name=None, chunksize=50000,
+                        sep=';', decimal=',', encoding='utf-8'):
+    """Lit un fichier officiel bloc par bloc ; chaque bloc est déjà renommé et converti"""
+    ext = os.path.splitext(path)[1].lower()
+    
+    if ext in ('.xlsx', '.xlsm'):
+        # Lecture en continu : les lignes du classeur ne sont jamais toutes en mémoire
+        import openpyxl
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name] if isinstance(sheet_name, str) else workbook.worksheets[sheet_name or 0]
+            rows = sheet.iter_rows(values_only=True)
+            # Les fichiers officiels commencent souvent par des lignes de titre
+            header = next((row for row in rows if _is_header(row, mapping)), None)
+            if header is None:
+                raise ValueError(f"Aucun en-tête reconnu dans {path}")
+            
+            renames = _map_columns([cell for cell in header if cell is not None], mapping)
+            positions = [k for k, label in enumerate(header) if label in renames]
+            columns = [renames[header[k]] for k in positions]
+            
+            chunk = []
+            for row in rows:
+                chunk.append([row[k] if k < len(row) else None for k in positions])
+                if len(chunk) >= chunksize:
+                    yield _clean_source_chunk(pd.DataFrame(chunk, columns=columns))
+                    chunk = []
+            if chunk:
+                yield _clean_source_chunk(pd.DataFrame(chunk, columns=columns))
+        finally:
+            workbook.close()
+    
+    elif ext == '.xls':
+        # Ancien format Excel (xlrd) : pas de lecture en continu possible
+        df = pd.read_excel(path, sheet_name=sheet_name or 0)
+        renames = _map_columns(df.columns, mapping)
+        yield _clean_source_chunk(df[list(renames)].rename(columns=renames))
+    
+    else:
+        header = pd.read_csv(path, sep=sep, encoding=encoding, nrows=0).columns
+        renames = _map_columns(header, mapping)
+        if 'Annee' not in renames.values():
+            raise ValueError(f"Colonne des années introuvable dans {path} (colonnes: {', '.join(map(str, header))}) ; "
+                             f"vérifier le séparateur (sep={sep!r})")
+        
+        for chunk in pd.read_csv(path, sep=sep, decimal=decimal, encoding=encoding,
+                                 usecols=list(renames), chunksize=chunksize):
+            yield _clean_source_chunk(chunk.rename(columns=renames))
+
+def _complete_source(df):
+    """Met un jeu de données officiel au schéma de generate_demographic_data :
+    format large, parts en fraction, colonnes dérivées calculées si possible"""
+    keys = ['Territoire', 'Annee'] if 'Territoire' in df.columns else ['Annee']
+    
+    if 'Indicateur' in df.columns and 'Valeur' in df.columns:
+        # Format long : une ligne par indicateur, remise au format large
+        labels = df['Indicateur'].astype(str)
+        known = {label: _source_aliases().get(_normalize_label(label)) for label in labels.unique()}
+        df = df.assign(Indicateur=labels.map(known)).dropna(subset=['Indicateur'])
+        df = df.pivot_table(index=keys, columns='Indicateur', values='Valeur', aggfunc='last').reset_index()
+        df.columns.name = None
+    
+    df = df.dropna(subset=['Annee']).astype({'Annee': 'int64'})
+    df = df.sort_values(keys, kind='stable').drop_duplicates(keys, keep='last').reset_index(drop=True)
+    
+    for col in FRACTION_COLUMNS:
+        if col in df.columns and df[col].max() > 1.5:
+            df[col] = df[col] / 100
+    
+    # Colonnes dérivées absentes de la source
+    if 'Population' in df.columns:
+        population = df.groupby(keys[:-1])['Population'] if len(keys) > 1 else df['Population']
+        df['Taux_Croissance'] = population.pct_change() * 100
+        for count, rate in [('Naissances', 'Taux_Natalite'), ('Deces', 'Taux_Mortalite')]:
+            if count in df.columns and rate not in df.columns:
+                df[rate] = df[count] / df['Population'] * 1000
+    if 'Solde_Naturel' not in df.columns and {'Naissances', 'Deces'} <= set(df.columns):
+        df['Solde_Naturel'] = df['Naissances'] - df['Deces']
+    if 'Part_20_60_Ans' not in df.columns and {'Part_Moins_20_Ans', 'Part_Plus_60_Ans'} <= set(df.columns):
+        df['Part_20_60_Ans'] = 1 - df['Part_Moins_20_Ans'] - df['Part_Plus_60_Ans']
+    
+    columns = keys + [col for col in COLUMN_GRAPH if col in df.columns]
+    return df[columns].astype({col: 'float64' for col in columns if col not in keys})
+
+def load_official_data(path, territoire=None, mapping=None, sheet_name=None, chunksize=50000,
+                       sep=';', decimal=',', encoding='utf-8', use_cache=True):
+    """Charge des séries officielles (INSEE/ISEE, CSV ou Excel) au schéma de generate_demographic_data.
+    La première lecture est convertie en cache binaire typé : les suivantes évitent l'analyse du fichier"""
+    cache = ResultCache()
+    stat = os.stat(path)
+    key = cache.key('source', os.path.abspath(path), stat.st_size, stat.st_mtime_ns,
+                    sorted((mapping or {}).items()), sheet_name, sep, decimal, encoding)
+    try:
+        import pyarrow  # noqa: F401
+        fmt = 'parquet'
+    except ImportError:
+        fmt = 'npz'
+    directory = os.path.join(cache.directory, 'sources')
+    cached = os.path.join(directory, f'{key}.{fmt}')
+    
+    if use_cache and os.path.exists(cached):
+        print(f"⚡ Données officielles chargées depuis le cache: {os.path.basename(path)}")
+        df = read_frame(cached)
+        df = df.astype({'Annee': 'int64', **({'Territoire': str} if 'Territoire' in df.columns else {})})
+    else:
+        print(f"📥 Lecture des données officielles: {path}")
+        df = _complete_source(pd.concat(_read_source_chunks(path, mapping, sheet_name, chunksize,
+                                                            sep, decimal, encoding), ignore_index=True))
+        if use_cache:
+            os.makedirs(directory, exist_ok=True)
+            tmp = os.path.join(directory, f'{key}.{os.getpid()}.tmp.{fmt}')
+            write_frame(df, tmp, fmt)
+            os.replace(tmp, cached)
+    
+    if territoire is None or 'Territoire' not in df.columns:
+        return df
+    
+    selected = df[df['Territoire'] == territoire].drop(columns='Territoire').reset_index(drop=True)
+    if selected.empty:
+        raise ValueError(f"Aucune donnée pour {territoire} dans {path}")
+    return selected
+
+class PartitionedWriter:
+    """Écrit des panels ou des ensembles par partitions de territoire, ajoutées au fil de l'eau.
+    En mode 'overwrite', les partitions d'une exécution précédente sont supprimées à la première
+    écriture de chaque territoire ; en mode 'append', la numérotation reprend après elles"""
+    
+    def __init__(self, output_dir, fmt='parquet', compression=None, float32=False, mode='overwrite'):
+        if mode not in ('overwrite', 'append'):
+            raise ValueError(f"Mode d'écriture inconnu: {mode}")
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.compression = compression
+        self.float32 = float32
+        self.mode = mode
+        self._next_part = {}
+    
+    def write(self, df, territoire=None):
+        """Ajoute une partition par territoire présent dans `df` (ou pour `territoire`)"""
+        if 'Territoire' in df.columns:
+            groups = df.groupby('Territoire', sort=False, observed=True)
+        else:
+            groups = [(territoire, df)]
+        
+        paths = []
+        for name, part in groups:
+            directory = os.path.join(self.output_dir, f'Territoire={name}')
+            os.makedirs(directory, exist_ok=True)
+            if name not in self._next_part:
+                parts = [entry for entry in os.listdir(directory) if entry.startswith('part-')]
+                if self.mode == 'overwrite':
+                    for entry in parts:
+                        os.remove(os.path.join(directory, entry))
+                    parts = []
+                # En ajout, reprendre après les partitions déjà présentes dans le dossier
+                self._next_part[name] = len(parts)
+            
+            path = write_frame(part.drop(columns='Territoire', errors='ignore'),
+                               os.path.join(directory, f'part-{self._next_part[name]:05d}.{self.fmt}'),
+                               self.fmt, self.compression, self.float32)
+            self._next_part[name] += 1
+            paths.append(path)
+        
+        return paths
+
+@lru_cache(maxsize=None)
+def _code_version():
+    """Empreinte du code source, pour invalider le cache à chaque modification"""
+    with open(__file__, 'rb') as source:
+        return hashlib.sha256(source.read()).hexdigest()
+
+class CommonNoise:
+    """Bruit gaussien standard pré-tiré (colonne × année × réplique), partagé par les scénarios comparés"""
+    
+    def __init__(self, columns, values, start_year):
+        self.columns = list(columns)
+        self.values = values
+        self.start_year = start_year
+    
+    @classmethod
+    def draw(cls, analyzer, n_replicates):
+        """Tire le tenseur dans les flux de l'analyseur : mêmes tirages qu'un ensemble en un seul bloc"""
+        n_years = analyzer.end_year - analyzer.start_year + 1
+        # Seules les colonnes de base sont bruitées (la population tendancielle ne l'est pas)
+        columns = [col for col, (requires, _) in COLUMN_GRAPH.items() if not requires and col != 'Population']
+        analyzer._reset_streams()
+        values = np.stack([analyzer._rng(analyzer.territoire, col).standard_normal((n_replicates, n_years)).T
+                           for col in columns])
+        return cls(columns, values, analyzer.start_year)
+    
+    @classmethod
+    def load(cls, path):
+        """Relit un tenseur enregistré par save"""
+        with np.load(path) as arrays:
+            return cls(arrays['columns'].tolist(), arrays['values'], int(arrays['start_year']))
+    
+    @property
+    def n_replicates(self):
+        return self.values.shape[2]
+    
+    def save(self, path):
+        """Enregistre le tenseur une fois pour toutes les comparaisons à venir"""
+        np.savez(path, columns=np.array(self.columns), values=self.values, start_year=self.start_year)
+        return path
+    
+    def sample(self, column, sigma, i, replicates, shape):
+        """Bruit multiplicatif N(1, sigma) des années `i` et des répliques `replicates`"""
+        i = np.asarray(i)
+        if not np.array_equal(i, np.floor(i)):
+            raise ValueError("Les nombres aléatoires communs ne s'appliquent qu'aux séries annuelles")
+        
+        z = self.values[self.columns.index(column)][i.astype(int)][:, replicates].T
+        return 1 + sigma * np.broadcast_to(z if len(shape) > 1 else z[0], shape)
+
+class StageTracer:
+    """Instrumentation optionnelle des étapes : durées murales et CPU, compteurs de lignes
+    et de répliques, profil cProfile des étapes demandées et, sur demande, pic mémoire
+    (tracemalloc ralentit nettement les allocations : les durées mesurées en sont gonflées)"""
+    
+    def __init__(self, profile_stages=(), memory=False):
+        self.profile_stages = set(profile_stages)
+        self.memory = memory
+        self.stages = {}
+        self._profilers = {}
+        self._profiling = False
+        self._peaks = []
+        self._owns_tracemalloc = False
+        self.started = datetime.now().isoformat(timespec='seconds')
+        
+        if memory:
+            import tracemalloc
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+    
+    @contextmanager
+    def stage(self, name, rows=0, replicates=0):
+        """Mesure une étape ; les appels successifs d'une même étape sont cumulés"""
+        profiler = None
+        if name in self.profile_stages and not self._profiling:
+            import cProfile
+            profiler = self._profilers.setdefault(name, cProfile.Profile())
+            self._profiling = True
+        
+        if self.memory:
+            # Le pic de l'étape englobante est conservé avant la remise à zéro
+            current, peak = self._tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            self._tracemalloc.reset_peak()
+            self._peaks.append(current)
+        
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+            
+            record = self.stages.setdefault(name, {'appels': 0, 'mur_s': 0.0, 'cpu_s': 0.0,
+                                                   'lignes': 0, 'repliques': 0})
+            record['appels'] += 1
+            record['mur_s'] += time.perf_counter() - wall
+            record['cpu_s'] += time.process_time() - cpu
+            record['lignes'] += int(rows)
+            record['repliques'] += int(replicates)
+            
+            if self.memory:
+                peak = max(self._peaks.pop(), self._tracemalloc.get_traced_memory()[1])
+                record['pic_memoire_mo'] = max(record.get('pic_memoire_mo', 0.0), peak / 1024 ** 2)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+    
+    def to_dict(self, top=25):
+        """Trace structurée de l'exécution (profils cProfile résumés en texte)"""
+        import io
+        import pstats
+        
+        profiles = {}
+        for name, profiler in self._profilers.items():
+            buffer = io.StringIO()
+            pstats.Stats(profiler, stream=buffer).sort_stats('cumulative').print_stats(top)
+            profiles[name] = buffer.getvalue()
+        return {'debut': self.started, 'etapes': self.stages, 'profils': profiles}
+    
+    def write(self, path):
+        """Écrit la trace JSON de l'exécution"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+    
+    def close(self):
+        """Arrête tracemalloc s'il a été démarré par ce traceur"""
+        if self._owns_tracemalloc:
+            self._tracemalloc.stop()
+            self._owns_tracemalloc = False
+        self.memory = False
+
+# Étape sans instrumentation : aucun coût lorsque le traçage est désactivé
+_NO_TRACE = nullcontext()
+
+class ResultCache:
+    """Cache disque des jeux de données générés, adressé par le contenu de leurs paramètres"""
+    
+    def __init__(self, directory=None, max_bytes=256 * 1024 ** 2):
+        self.directory = directory or os.environ.get(
+            'IDH_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'idh_dromcom'))
+        self.max_bytes = max_bytes
+    
+    def key(self, *parts):
+        """Calcule la clé d'un résultat à partir de tout ce qui le détermine"""
+        return hashlib.sha256(repr(parts + (_code_version(),)).encode('utf-8')).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.pkl')
+    
+    def load(self, key):
+        """Retourne le DataFrame en cache, ou None s'il est absent ou illisible"""
+        path = self._path(key)
+        try:
+            df = pd.read_pickle(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+            # Entrée tronquée ou corrompue : supprimée, elle sera recalculée
+            self._remove(path)
+            return None
+        
+        # Marquer l'entrée comme récemment utilisée (éviction LRU) ; un autre
+        # processus peut l'avoir évincée entre-temps
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return df
+    
+    def store(self, key, df):
+        """Enregistre un DataFrame puis évince les entrées les plus anciennes si besoin"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        self._evict()
+    
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Supprimée par un autre processus (--jobs) pendant le parcours
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+    
+    def _remove(self, path):
+        """Supprime une entrée, qu'un autre processus peut avoir déjà supprimée"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
 class DromcomDemographyAnalyzer:
-    def __init__(self, territoire_name):
+    def __init__(self, territoire_name, start_year=2002, end_year=2025, seed=None, model='tendance'):
+        if model not in PROJECTION_MODELS:
+            raise ValueError(f"Modèle de projection inconnu: {model}")
+        
         self.territoire = territoire_name
+        self.model = model
         self.colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#F9A602', '#6A0572', 
                       '#AB83A1', '#5CAB7D', '#2A9D8F', '#E76F51', '#264653']
         
-        self.start_year = 2002
-        self.end_year = 2025
+        self.start_year = start_year
+        self.end_year = end_year
         
-        # Configuration spécifique à chaque territoire
+        # Configuration spécifique à chaque territoire, compilée une fois pour les simulateurs
         self.config = self._get_territoire_config()
+        self.profile = TerritoryProfile.from_config(self.territoire, self.config)
         
-    def _get_territoire_config(self):
-        """Retourne la configuration spécifique pour chaque DROM-COM"""
-        configs = {
-            "Guadeloupe": {
-                "population_base": 390000,
-                "natalite_base": 12.5,
-                "mortalite_base": 7.2,
-                "idh_base": 0.82,
-                "specialites": ["tourisme", "agriculture", "services"]
-            },
-            "Martinique": {
-                "population_base": 375000,
-                "natalite_base": 11.8,
-                "mortalite_base": 7.5,
-                "idh_base": 0.84,
-                "specialites": ["tourisme", "banane", "rhum", "services"]
-            },
-            "Guyane": {
-                "population_base": 290000,
-                "natalite_base": 25.4,
-                "mortalite_base": 4.8,
-                "idh_base": 0.76,
-                "specialites": ["spatial", "or", "biodiversite", "foret"]
-            },
-            "La Réunion": {
-                "population_base": 860000,
-                "natalite_base": 15.2,
-                "mortalite_base": 6.3,
-                "idh_base": 0.80,
-                "specialites": ["tourisme", "canne", "services", "numerique"]
-            },
-            "Mayotte": {
-                "population_base": 280000,
-                "natalite_base": 35.7,
-                "mortalite_base": 4.2,
-                "idh_base": 0.69,
-                "specialites": ["agriculture", "peche", "jeunesse"]
-            },
-            "Saint-Martin": {
-                "population_base": 35000,
-                "natalite_base": 14.3,
-                "mortalite_base": 5.8,
-                "idh_base": 0.78,
-                "specialites": ["tourisme", "commerce", "plages"]
-            },
-            "Saint-Barthélemy": {
-                "population_base": 9800,
-                "natalite_base": 9.8,
-                "mortalite_base": 6.2,
-                "idh_base": 0.88,
-                "specialites": ["luxe", "tourisme", "plages"]
-            },
-            "Saint-Pierre-et-Miquelon": {
-                "population_base": 6000,
-                "natalite_base": 8.5,
-                "mortalite_base": 9.1,
-                "idh_base": 0.83,
-                "specialites": ["peche", "tourisme", "froid"]
-            },
-            "Wallis-et-Futuna": {
-                "population_base": 11500,
-                "natalite_base": 16.2,
-                "mortalite_base": 5.4,
-                "idh_base": 0.79,
-                "specialites": ["traditions", "peche", "agriculture"]
-            },
-            "Polynésie française": {
-                "population_base": 280000,
-                "natalite_base": 14.8,
-                "mortalite_base": 5.6,
-                "idh_base": 0.81,
-                "specialites": ["tourisme", "perliculture", "peche"]
-            },
-            "Nouvelle-Calédonie": {
-                "population_base": 270000,
-                "natalite_base": 15.3,
-                "mortalite_base": 5.9,
-                "idh_base": 0.83,
-                "specialites": ["nickel", "tourisme", "biodiversite"]
-            },
-            # Configuration par défaut
-            "default": {
-                "population_base": 100000,
-                "natalite_base": 12.0,
-                "mortalite_base": 7.0,
-                "idh_base": 0.75,
-                "specialites": ["services", "tourisme"]
-            }
-        }
-        
-        return configs.get(self.territoire, configs["default"])
-    
-    def generate_demographic_data(self):
-        """Génère des données démographiques pour le territoire"""
-        print(f"🏝️ Génération des données démographiques pour {self.territoire}...")
-        
-        # Créer une base de données annuelle
-        dates = pd.date_range(start=f'{self.start_year}-01-01', 
-                             end=f'{self.end_year}-12-31', freq='Y')
-        
-        data = {'Annee': [date.year for date in dates]}
-        
-        # Données démographiques de base
-        data['Population'] = self._simulate_population(dates)
-        data['Naissances'] = self._simulate_births(dates)
-        data['Deces'] = self._simulate_deaths(dates)
+        # Graine des flux aléatoires ; tirée au hasard mais conservée si absente
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.seeded = seed is not None
+        self._streams = {}
+        self._cohort_state = None
+        self._common_noise = None
         
-        # Taux démographiques (pour 1000 habitants)
-        data['Taux_Natalite'] = self._simulate_birth_rate(dates)
-        data['Taux_Mortalite'] = self._simulate_death_rate(dates)
-        data['Solde_Naturel'] = self._simulate_natural_balance(dates)
+        # Événements appliqués ; des scénarios peuvent y ajouter leurs propres règles
+        self.evenements = list(TERRITOIRE_EVENEMENTS)
         
-        # Indice de développement humain
-        data['IDH'] = self._simulate_hdi(dates)
+        # Cache disque des jeux de données (voir generate_demographic_data)
+        self.cache = ResultCache()
         
-        # Espérance de vie
-        data['Esperance_Vie'] = self._simulate_life_expectancy(dates)
+        # Instrumentation des étapes, désactivée par défaut (voir enable_tracing)
+        self.tracer = None
         
-        # Migration
-        data['Solde_Migratoire'] = self._simulate_migration_balance(dates)
+    def enable_tracing(self, profile_stages=(), memory=False):
+        """Active la mesure des étapes ; `profile_stages` sont en plus profilées avec cProfile,
+        `memory` ajoute le pic mémoire de chaque étape (tracemalloc, coûteux)"""
+        self.tracer = StageTracer(profile_stages, memory)
+        return self.tracer
+    
+    def _stage(self, name, rows=0, replicates=0):
+        """Étape instrumentée, sans effet si le traçage est désactivé"""
+        if self.tracer is None:
+            return _NO_TRACE
+        return self.tracer.stage(name, rows, replicates)
+    
+    def _get_territoire_config(self):
+        """Retourne la configuration spécifique pour chaque DROM-COM"""
+        return dict(TERRITOIRE_CONFIGS["default"], **TERRITOIRE_CONFIGS.get(self.territoire, {}))
+    
+    def generate_demographic_data(self, columns=None, use_cache=False, freq='Y'):
+        """Génère des données démographiques pour le territoire (toutes les colonnes ou seulement `columns`),
+        annuelles ou trimestrielles/mensuelles selon `freq` ; le cache n'est utilisé qu'avec une graine explicite"""
+        # Sans graine explicite, chaque analyseur tire une graine neuve : son entrée de
+        # cache ne serait jamais relue et évincerait des entrées utiles
+        use_cache = use_cache and self.seeded
+        if use_cache:
+            key = self.cache.key('demographic_data', self.profile, self.evenements, SAISONNALITE,
+                                 self.start_year, self.end_year, self.seed, self.model, freq,
+                                 None if columns is None else tuple(columns))
+            df = self.cache.load(key)
+            if df is not None:
+                print(f"⚡ Données démographiques de {self.territoire} chargées depuis le cache")
+                return df
         
-        # Structure par âge
-        data['Part_Moins_20_Ans'] = self._simulate_young_population(dates)
-        data['Part_Plus_60_Ans'] = self._simulate_elderly_population(dates)
+        print(f"🏝️ Génération des données démographiques pour {self.territoire}...")
         
-        # Indicateurs socio-économiques
-        data['Taux_Chomage'] = self._simulate_unemployment(dates)
-        data['PIB_Par_Habitant'] = self._simulate_gdp_per_capita(dates)
+        # Une valeur par période ; les simulateurs reçoivent des années fractionnaires
+        times, years, months = _time_points(self.start_year, self.end_year, freq)
         
-        df = pd.DataFrame(data)
+        data = {'Annee': years}
+        if freq != 'Y':
+            data['Mois'] = months
+        self._reset_streams()
+        series = self._simulate_columns(times, columns=self._resolve_columns(columns), freq=freq)
+        with self._stage('dataframe', rows=len(times)):
+            data.update({col: values for col, values in series.items() if columns is None or col in columns})
+            df = pd.DataFrame(data)
+            df.attrs['simulation'] = self._simulation_state(series)
         
-        # Ajouter des tendances spécifiques au territoire
-        self._add_territory_trends(df)
+        if use_cache:
+            self.cache.store(key, df)
         
         return df
     
-    def _simulate_population(self, dates):
-        """Simule la population du territoire"""
-        base_population = self.config["population_base"]
-        
-        population = []
-        for i, date in enumerate(dates):
-            # Croissance démographique variable selon le territoire
-            if self.territoire == "Mayotte":
-                growth_rate = 0.035  # Croissance très forte à Mayotte
-            elif self.territoire == "Guyane":
-                growth_rate = 0.028  # Croissance forte en Guyane
-            elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                growth_rate = 0.018  # Croissance modérée dans les petites îles
-            elif self.territoire == "Saint-Pierre-et-Miquelon":
-                growth_rate = -0.003  # Décroissance à Saint-Pierre-et-Miquelon
-            else:
-                growth_rate = 0.012  # Croissance modérée ailleurs
-                
-            growth = 1 + growth_rate * i
-            population.append(base_population * growth)
-        
-        return population
+    def extend(self, df, new_end_year):
+        """Prolonge un jeu de données jusqu'à `new_end_year` ; les années existantes ne sont pas recalculées"""
+        if 'Mois' in df.columns:
+            raise ValueError("Seules les séries annuelles peuvent être prolongées")
+        
+        last_year = int(df['Annee'].iloc[-1])
+        if new_end_year <= last_year:
+            return df
+        
+        columns = [col for col in df.columns if col in COLUMN_GRAPH]
+        needed = self._resolve_columns(columns)
+        state = df.attrs.get('simulation')
+        expected = {'territoire': self.territoire, 'model': self.model, 'seed': self.seed,
+                    'start_year': self.start_year, 'end_year': last_year, 'columns': needed}
+        
+        if state is not None and all(state.get(key) == value for key, value in expected.items()):
+            # Reprendre les flux aléatoires et la projection là où ils s'étaient arrêtés
+            self._restore_state(state)
+            previous_population = state['population']
+        else:
+            # Sans état enregistré (fichier relu par exemple), l'historique est rejoué
+            # avec la graine de l'analyseur pour retrouver les flux aléatoires
+            if int(df['Annee'].iloc[0]) != self.start_year:
+                raise ValueError(f"Les données commencent en {int(df['Annee'].iloc[0])} et non en "
+                                 f"{self.start_year} : l'historique ne peut pas être rejoué")
+            print(f"🔁 État de simulation absent : l'historique de {self.territoire} est rejoué")
+            self._reset_streams()
+            history = self._simulate_columns(np.arange(self.start_year, last_year + 1), columns=needed)
+            previous_population = history['Population'][-1] if 'Population' in history else None
+        
+        print(f"➕ Prolongation des données de {self.territoire} jusqu'en {new_end_year}...")
+        years = np.arange(last_year + 1, new_end_year + 1)
+        series = self._simulate_block(years, self.profile, needed, previous_population)
+        self.end_year = new_end_year
+        
+        new_rows = pd.DataFrame({'Annee': years, **{col: series[col] for col in columns}})
+        extended = pd.concat([df, new_rows.astype(df.dtypes.to_dict())], ignore_index=True)
+        extended.attrs['simulation'] = self._simulation_state(series)
+        return extended
     
-    def _simulate_births(self, dates):
-        """Simule le nombre de naissances"""
-        base_births = self.config["population_base"] * (self.config["natalite_base"] / 1000)
-        
-        births = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution différente selon les territoires
-            if self.territoire == "Mayotte":
-                trend = 1 - 0.003 * i  # Légère baisse à Mayotte
-            elif self.territoire == "Guyane":
-                trend = 1 - 0.002 * i  # Légère baisse en Guyane
-            elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                trend = 1 - 0.005 * i  # Baisse plus marquée
-            else:
-                trend = 1 - 0.004 * i  # Baisse modérée
-            
-            noise = np.random.normal(1, 0.07)
-            births.append(base_births * trend * noise)
-        
-        return births
+    def _simulation_state(self, series):
+        """État nécessaire pour prolonger la série : flux aléatoires, dernière population, cohortes"""
+        population = series['Population'][-1] if 'Population' in series else None
+        return {
+            'territoire': self.territoire, 'model': self.model, 'seed': self.seed,
+            'start_year': self.start_year, 'end_year': self.end_year, 'columns': list(series),
+            'population': None if population is None else float(population),
+            'streams': {column: rng.bit_generator.state for (territoire, column), rng in self._streams.items()
+                        if territoire == self.territoire},
+            'cohorts': None if self._cohort_state is None else
+                       [int(self._cohort_state[0]), self._cohort_state[1].tolist()],
+        }
     
-    def _simulate_deaths(self, dates):
-        """Simule le nombre de décès"""
-        base_deaths = self.config["population_base"] * (self.config["mortalite_base"] / 1000)
-        
-        deaths = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution différente selon les territoires (vieillissement)
-            if self.territoire in ["Martinique", "Guadeloupe"]:
-                trend = 1 + 0.008 * i  # Augmentation due au vieillissement
-            elif self.territoire == "Saint-Pierre-et-Miquelon":
-                trend = 1 + 0.01 * i  # Forte augmentation
-            elif self.territoire in ["Mayotte", "Guyane"]:
-                trend = 1 + 0.004 * i  # Faible augmentation (population jeune)
-            else:
-                trend = 1 + 0.006 * i  # Augmentation modérée
+    def _restore_state(self, state):
+        """Restaure les flux aléatoires et la projection enregistrés par _simulation_state"""
+        self._reset_streams()
+        for column, stream_state in state['streams'].items():
+            self._rng(self.territoire, column).bit_generator.state = stream_state
+        if state['cohorts'] is not None:
+            self._cohort_state = (state['cohorts'][0], np.array(state['cohorts'][1]))
+    
+    def _simulate_columns(self, years, profile=None, columns=None, freq='Y'):
+        """Construit les séries selon le graphe des colonnes ; avec un profil empilé, chaque ligne est un territoire"""
+        profile = self.profile if profile is None else profile
+        needed = self._resolve_columns(columns)
+        if freq != 'Y' and self.model == 'cohortes':
+            raise ValueError("Le modèle par cohortes procède par pas annuels (freq='Y')")
+        
+        # Avec le modèle par composantes, la projection des cohortes remplace les
+        # simulateurs de ses colonnes et consomme le solde migratoire simulé
+        cohorts = self.model == 'cohortes' and any(col in COHORT_COLUMNS for col in needed)
+        base = [col for col in needed
+                if not COLUMN_GRAPH[col][0] and not (cohorts and col in COHORT_COLUMNS)]
+        if cohorts and 'Solde_Migratoire' not in base:
+            base.append('Solde_Migratoire')
+        
+        rows = np.size(profile.population_base) * len(years)
+        replicates = 0 if np.ndim(profile.territoire) > 0 else np.size(profile.population_base)
+        
+        # Colonnes de base : chaque simulateur n'est appelé qu'une fois
+        with self._stage('simulation', rows, replicates):
+            data = {col: getattr(self, COLUMN_GRAPH[col][1])(years, profile) for col in base}
+        
+        # Ajouter des tendances spécifiques au territoire ; pour les cohortes, les
+        # événements sur les taux s'appliquent aux taux par âge de la projection
+        with self._stage('evenements', rows):
+            multipliers = self._event_multipliers(years, profile.territoire,
+                                                  base + (COHORT_COLUMNS if cohorts else []))
+            for col in base:
+                if col in multipliers:
+                    data[col] = data[col] * multipliers[col]
+        
+        if cohorts:
+            with self._stage('cohortes', rows, replicates):
+                data.update(self._project_cohorts(years, profile, data['Solde_Migratoire'],
+                                                  multipliers.get('Taux_Natalite', 1.0),
+                                                  multipliers.get('Taux_Mortalite', 1.0)))
+        
+        if freq != 'Y':
+            self._apply_seasonality(data, years, profile, FREQUENCIES[freq])
+        
+        # Colonnes dérivées, calculées sur les colonnes déjà construites
+        with self._stage('derivees', rows):
+            for col in needed:
+                requires, method = COLUMN_GRAPH[col]
+                if requires:
+                    data[col] = getattr(self, method)(data)
+        
+        requested = needed if columns is None else set(columns)
+        return {col: data[col] for col in COLUMN_GRAPH if col in requested}
+    
+    def iter_batches(self, batch_size=10, columns=None, profile=None):
+        """Génère le jeu de données par blocs successifs de `batch_size` années (mémoire constante)"""
+        profile = self.profile if profile is None else profile
+        for years, data in self._iter_blocks(batch_size, profile, columns):
+            block = {'Annee': years}
+            block.update(data)
+            yield pd.DataFrame(block)
+    
+    def iter_years(self, columns=None):
+        """Génère le jeu de données une année à la fois (une ligne par année)"""
+        for years, data in self._iter_blocks(1, self.profile, columns):
+            row = {'Annee': int(years[0])}
+            row.update({col: values[0] for col, values in data.items()})
+            yield row
+    
+    def _iter_blocks(self, batch_size, profile, columns=None):
+        """Simule les années par blocs ; les événements sont appliqués à chaque bloc.
+        Les flux aléatoires sont tirés à la suite : les blocs concaténés
+        reproduisent exactement generate_demographic_data"""
+        needed = self._resolve_columns(columns)
+        requested = needed if columns is None else set(columns)
+        self._reset_streams()
+        
+        previous_population = None
+        for start in range(self.start_year, self.end_year + 1, batch_size):
+            years = np.arange(start, min(start + batch_size, self.end_year + 1))
+            data = self._simulate_block(years, profile, needed, previous_population)
+            if 'Population' in data:
+                previous_population = data['Population'][..., -1]
             
-            noise = np.random.normal(1, 0.05)
-            deaths.append(base_deaths * trend * noise)
-        
-        return deaths
+            yield years, {col: values for col, values in data.items() if col in requested}
     
-    def _simulate_birth_rate(self, dates):
-        """Simule le taux de natalité (pour 1000 habitants)"""
-        base_rate = self.config["natalite_base"]
+    def _simulate_block(self, years, profile, needed, previous_population=None):
+        """Simule un bloc d'années à la suite du précédent (flux aléatoires déjà avancés)"""
+        data = self._simulate_columns(years, profile, needed)
         
-        rates = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution différente selon les territoires
-            if self.territoire == "Mayotte":
-                trend = 1 - 0.015 * i  # Baisse rapide à Mayotte
-            elif self.territoire == "Guyane":
-                trend = 1 - 0.01 * i  # Baisse modérée en Guyane
-            elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                trend = 1 - 0.012 * i  # Baisse marquée
-            else:
-                trend = 1 - 0.008 * i  # Baisse modérée
-            
-            noise = np.random.normal(1, 0.04)
-            rates.append(base_rate * trend * noise)
+        # Le taux de croissance de la première année du bloc dépend
+        # de la dernière population du bloc précédent
+        if 'Taux_Croissance' in data and previous_population is not None:
+            population = data['Population'][..., 0]
+            data['Taux_Croissance'][..., 0] = (population - previous_population) / previous_population * 100
         
-        return rates
+        return data
     
-    def _simulate_death_rate(self, dates):
-        """Simule le taux de mortalité (pour 1000 habitants)"""
-        base_rate = self.config["mortalite_base"]
-        
-        rates = []
-        for i, date in enumerate(dates):
-            year = date.year
+    def _apply_seasonality(self, data, years, profile, periods):
+        """Répartit les flux annuels entre les périodes et applique les composantes saisonnières"""
+        for col in FLOW_COLUMNS:
+            if col in data:
+                data[col] = data[col] / periods
+        
+        # Indice de la période dans l'année ; un trimestre prend la moyenne de ses mois
+        period = np.rint((np.asarray(years) % 1) * periods).astype(int)
+        for col, (monthly, specialite) in SAISONNALITE.items():
+            if col not in data:
+                continue
             
-            # Évolution différente selon les territoires
-            if self.territoire in ["Martinique", "Guadeloupe"]:
-                trend = 1 + 0.006 * i  # Augmentation due au vieillissement
-            elif self.territoire == "Saint-Pierre-et-Miquelon":
-                trend = 1 + 0.008 * i  # Forte augmentation
-            elif self.territoire in ["Mayotte", "Guyane"]:
-                trend = 1 + 0.003 * i  # Faible augmentation
-            else:
-                trend = 1 + 0.005 * i  # Augmentation modérée
-            
-            noise = np.random.normal(1, 0.03)
-            rates.append(base_rate * trend * noise)
-        
-        return rates
+            factors = np.asarray(monthly).reshape(periods, -1).mean(axis=1)[period]
+            if specialite is not None:
+                specialites = profile.specialites
+                if np.ndim(profile.territoire) > 0:
+                    concerned = np.array([specialite in s for s in specialites])[:, None]
+                else:
+                    concerned = specialite in specialites
+                factors = np.where(concerned, factors, 1.0)
+            data[col] = data[col] * factors
     
-    def _simulate_natural_balance(self, dates):
-        """Simule le solde naturel (naissances - décès)"""
-        balance = []
-        for i, date in enumerate(dates):
-            # Calcul basé sur les naissances et décès simulés
-            balance.append(self._simulate_births([date])[0] - self._simulate_deaths([date])[0])
-        
-        return balance
+    def _resolve_columns(self, columns=None):
+        """Retourne, dans l'ordre du graphe, les colonnes à construire pour obtenir `columns`"""
+        if columns is None:
+            return list(COLUMN_GRAPH)
+        
+        unknown = [col for col in columns if col not in COLUMN_GRAPH]
+        if unknown:
+            raise ValueError(f"Colonnes inconnues: {', '.join(unknown)}")
+        
+        needed = set()
+        pending = list(columns)
+        while pending:
+            col = pending.pop()
+            if col not in needed:
+                needed.add(col)
+                pending.extend(COLUMN_GRAPH[col][0])
+        
+        return [col for col in COLUMN_GRAPH if col in needed]
     
-    def _simulate_hdi(self, dates):
-        """Simule l'Indice de Développement Humain"""
-        base_hdi = self.config["idh_base"]
-        
-        hdi_values = []
-        for i, date in enumerate(dates):
-            year = date.year
+    def sweep(self, param_grid, columns=None, chunk_size=1000, common_noise=None):
+        """Évalue toutes les combinaisons de `param_grid` (paramètre du profil -> valeurs),
+        diffusées sur un axe de scénarios ; retourne (résultats au format long, résumé par scénario).
+        Avec `common_noise`, tous les scénarios suivent la même trajectoire aléatoire (la première)"""
+        unknown = [key for key in param_grid if key not in PROFILE_FIELDS]
+        if unknown:
+            raise ValueError(f"Paramètres inconnus: {', '.join(unknown)}")
+        
+        names = list(param_grid)
+        axes = [np.atleast_1d(np.asarray(param_grid[key], dtype=float)) for key in names]
+        grid = np.stack([axis.ravel() for axis in np.meshgrid(*axes, indexing='ij')], axis=-1).reshape(-1, len(names))
+        print(f"🧪 Balayage de {len(grid):,} scénarios pour {self.territoire}...")
+        
+        years = np.arange(self.start_year, self.end_year + 1)
+        frames, summaries = [], []
+        self._reset_streams()
+        if common_noise is not None:
+            self._use_common_noise(common_noise, slice(0, 1))
+        
+        # Les scénarios sont traités par blocs : chaque ligne du profil est un scénario
+        for start in range(0, len(grid), chunk_size):
+            block = grid[start:start + chunk_size]
+            size = len(block)
+            profile = self.profile.broadcast(size)._replace(
+                **{key: block[:, [j]] for j, key in enumerate(names)})
+            try:
+                series = self._simulate_columns(years, profile, columns)
+            except BaseException:
+                self._common_noise = None
+                raise
             
-            # Amélioration générale de l'IDH avec des variations selon les territoires
-            if self.territoire in ["Saint-Barthélemy", "Martinique"]:
-                improvement = 1 + 0.004 * i  # Amélioration lente (déjà élevé)
-            elif self.territoire in ["Mayotte", "Guyane"]:
-                improvement = 1 + 0.008 * i  # Amélioration plus rapide
-            else:
-                improvement = 1 + 0.006 * i  # Amélioration modérée
+            scenarios = np.arange(start, start + size)
+            data = {'Scenario': np.repeat(scenarios, len(years))}
+            data.update({key: np.repeat(block[:, j], len(years)) for j, key in enumerate(names)})
+            data['Annee'] = np.tile(years, size)
+            data.update({col: values.ravel() for col, values in series.items()})
+            frames.append(pd.DataFrame(data))
             
-            # Ne pas dépasser 0.95 (plafond réaliste)
-            new_hdi = min(base_hdi * improvement, 0.95)
+            # Résumé calculé sur les matrices scénarios × années, sans regroupement
+            summary = {'Scenario': scenarios}
+            summary.update({key: block[:, j] for j, key in enumerate(names)})
+            for col, values in series.items():
+                summary[f'{col}_moyenne'] = np.nanmean(values, axis=1)
+                summary[f'{col}_{self.end_year}'] = values[:, -1]
+            summaries.append(pd.DataFrame(summary))
+        
+        self._common_noise = None
+        return pd.concat(frames, ignore_index=True), pd.concat(summaries, ignore_index=True)
+    
+    def _ensemble_passes(self, columns, n_replicates, n_years, copies=1):
+        """Répartit les colonnes demandées en passes dont les trajectoires complètes
+        (`copies` tableaux répliques × années par colonne) tiennent dans ENSEMBLE_MEMORY_BUDGET"""
+        self._resolve_columns(columns)
+        requested = [col for col in COLUMN_GRAPH if columns is None or col in columns]
+        per_pass = max(1, ENSEMBLE_MEMORY_BUDGET // (n_replicates * n_years * 8 * copies))
+        return [requested[k:k + per_pass] for k in range(0, len(requested), per_pass)]
+    
+    def generate_ensemble(self, n_replicates, quantiles=(0.05, 0.5, 0.95), chunk_size=10000, columns=None,
+                          common_noise=None):
+        """Simule un ensemble Monte Carlo et retourne les quantiles annuels de chaque indicateur
+        (trajectoires tirées dans `common_noise` si fourni)"""
+        print(f"🎲 Simulation de {n_replicates:,} trajectoires pour {self.territoire}...")
+        
+        years = np.arange(self.start_year, self.end_year + 1)
+        quantiles = np.asarray(quantiles, dtype=float)
+        data = {'Annee': years}
+        
+        # Les répliques sont simulées par blocs pour borner la mémoire de travail ; les
+        # trajectoires des colonnes d'une passe sont rassemblées, si bien que les quantiles
+        # sont exacts et ne dépendent pas de chunk_size
+        for group in self._ensemble_passes(columns, n_replicates, len(years)):
+            self._reset_streams()
+            paths = {col: np.empty((n_replicates, len(years))) for col in group}
+            for start in range(0, n_replicates, chunk_size):
+                size = min(chunk_size, n_replicates - start)
+                if common_noise is not None:
+                    self._use_common_noise(common_noise, slice(start, start + size), n_replicates)
+                
+                # Chaque réplique est une ligne : les paramètres sont diffusés sur le bloc
+                try:
+                    block = self._simulate_columns(years, self.profile.broadcast(size), group)
+                finally:
+                    self._common_noise = None
+                for col, values in block.items():
+                    paths[col][start:start + size] = values
             
-            noise = np.random.normal(1, 0.01)
-            hdi_values.append(new_hdi * noise)
+            with self._stage('quantiles', n_replicates * len(years), n_replicates):
+                for col, values in paths.items():
+                    for q, row in zip(quantiles, np.quantile(values, quantiles, axis=0)):
+                        data[f'{col}_p{q * 100:g}'] = row
         
-        return hdi_values
+        return pd.DataFrame(data)
     
-    def _simulate_life_expectancy(self, dates):
-        """Simule l'espérance de vie"""
-        # Espérance de vie de base selon le territoire
-        if self.territoire in ["Martinique", "Guadeloupe", "La Réunion"]:
-            base_expectancy = 78.5
-        elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-            base_expectancy = 79.2
-        elif self.territoire == "Mayotte":
-            base_expectancy = 75.8
-        elif self.territoire == "Guyane":
-            base_expectancy = 76.3
-        elif self.territoire == "Saint-Pierre-et-Miquelon":
-            base_expectancy = 77.6
-        else:
-            base_expectancy = 77.0
-        
-        expectancy = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Amélioration générale de l'espérance de vie
-            improvement = 1 + 0.002 * i
-            
-            # Ne pas dépasser 85 ans (plafond réaliste)
-            new_expectancy = min(base_expectancy * improvement, 85)
+    def compare_scenarios(self, scenarios, n_replicates=1000, quantiles=(0.05, 0.5, 0.95), columns=None,
+                          common_noise=None, chunk_size=10000):
+        """Compare des scénarios (nom -> paramètres du profil modifiés, et 'evenements' pour des
+        règles supplémentaires) sur des trajectoires appariées : retourne les quantiles annuels
+        des écarts de chaque scénario au premier, qui sert de référence"""
+        names = list(scenarios)
+        if len(names) < 2:
+            raise ValueError("Au moins deux scénarios sont nécessaires : la référence et un scénario comparé")
+        for name in names:
+            unknown = [key for key in scenarios[name] if key not in PROFILE_FIELDS and key != 'evenements']
+            if unknown:
+                raise ValueError(f"Paramètres inconnus pour le scénario {name}: {', '.join(unknown)}")
+        
+        print(f"⚖️ Comparaison de {len(names)} scénarios sur {n_replicates:,} trajectoires appariées...")
+        
+        # Un seul tenseur de bruit, lu par tous les scénarios
+        noise = CommonNoise.draw(self, n_replicates) if common_noise is None else common_noise
+        years = np.arange(self.start_year, self.end_year + 1)
+        quantiles = np.asarray(quantiles, dtype=float)
+        base_events = self.evenements
+        data = {name: {'Scenario': name, 'Annee': years} for name in names[1:]}
+        
+        # Écarts calculés trajectoire par trajectoire et rassemblés par passe de colonnes,
+        # puis résumés par des quantiles exacts
+        for group in self._ensemble_passes(columns, n_replicates, len(years), max(len(names) - 1, 1)):
+            deltas = {(name, col): np.empty((n_replicates, len(years))) for name in names[1:] for col in group}
+            for start in range(0, n_replicates, chunk_size):
+                size = min(chunk_size, n_replicates - start)
+                self._use_common_noise(noise, slice(start, start + size), n_replicates)
+                
+                paths = {}
+                try:
+                    for name in names:
+                        overrides = dict(scenarios[name])
+                        self.evenements = base_events + list(overrides.pop('evenements', []))
+                        profile = self.profile._replace(**overrides).broadcast(size)
+                        paths[name] = self._simulate_columns(years, profile, group)
+                finally:
+                    self._common_noise = None
+                    self.evenements = base_events
+                
+                for name in names[1:]:
+                    for col, values in paths[name].items():
+                        deltas[name, col][start:start + size] = values - paths[names[0]][col]
             
-            noise = np.random.normal(1, 0.005)
-            expectancy.append(new_expectancy * noise)
+            for (name, col), values in deltas.items():
+                for q, row in zip(quantiles, np.quantile(values, quantiles, axis=0)):
+                    data[name][f'{col}_p{q * 100:g}'] = row
         
-        return expectancy
+        return pd.concat([pd.DataFrame(data[name]) for name in names[1:]], ignore_index=True)
+    
+    def _use_common_noise(self, noise, replicates, n_replicates=1):
+        """Active la lecture du tenseur de bruit commun pour les répliques `replicates`"""
+        n_years = self.end_year - self.start_year + 1
+        if noise.start_year != self.start_year or noise.values.shape[1] < n_years:
+            raise ValueError("Le tenseur de bruit commun ne couvre pas la période simulée")
+        if noise.n_replicates < n_replicates:
+            raise ValueError(f"Le tenseur de bruit commun ne contient que {noise.n_replicates:,} répliques")
+        self._common_noise = (noise, replicates)
+    
+    def _year_index(self, years):
+        """Retourne l'indice de chaque année depuis le début de la période"""
+        return np.asarray(years) - self.start_year
+    
+    def _noise(self, column, sigma, profile, i):
+        """Tire en un seul appel le bruit multiplicatif de toute la série"""
+        shape = np.broadcast_shapes(np.shape(profile.population_base), np.shape(i))
+        if self._common_noise is not None:
+            # Nombres aléatoires communs : les scénarios lisent le même tenseur
+            noise, replicates = self._common_noise
+            return noise.sample(column, sigma, i, replicates, shape)
+        
+        if np.ndim(profile.territoire) == 0:
+            return self._rng(profile.territoire, column).normal(1, sigma, shape)
+        
+        # Profil empilé : chaque ligne est tirée dans le flux de son territoire
+        return np.stack([self._rng(territoire, column).normal(1, sigma, shape[1:])
+                         for territoire in np.ravel(profile.territoire)])
+    
+    def _reset_streams(self):
+        """Repart des flux aléatoires issus de la graine (même graine, mêmes séries)"""
+        self._streams = {}
+        self._cohort_state = None
+    
+    def _rng(self, territoire, column):
+        """Retourne le générateur propre à un couple (territoire, colonne)"""
+        territoire = str(territoire)
+        if (territoire, column) not in self._streams:
+            # Le flux d'un territoire ne dépend que de la graine et de son nom,
+            # chaque colonne en reçoit un flux enfant : les résultats ne dépendent
+            # ni de l'ordre des territoires ni du processus qui les calcule
+            territory_seq = np.random.SeedSequence(
+                self.seed, spawn_key=(zlib.crc32(territoire.encode('utf-8')),))
+            for col, child in zip(COLUMN_GRAPH, territory_seq.spawn(len(COLUMN_GRAPH))):
+                self._streams[(territoire, col)] = np.random.default_rng(child)
+        
+        return self._streams[(territoire, column)]
+    
+    def _simulate_population(self, years, profile=None):
+        """Simule la population du territoire"""
+        profile = self.profile if profile is None else profile
+        i = self._year_index(years)
+        return profile.population_base * (1 + profile.croissance_population * i)
     
-    def _simulate_migration_balance(self, dates):
+    def _simulate_births(self, years, profile=None):
+        """Simule le nombre de naissances"""
+        profile = self.profile if profile is None else profile
+        base_births = profile.population_base * (profile.natalite_base / 1000)
+        i = self._year_index(years)
+        return base_births * (1 + profile.tendance_naissances * i) * self._noise('Naissances', 0.07, profile, i)
+    
+    def _simulate_deaths(self, years, profile=None):
+        """Simule le nombre de décès"""
+        profile = self.profile if profile is None else profile
+        base_deaths = profile.population_base * (profile.mortalite_base / 1000)
+        i = self._year_index(years)
+        return base_deaths * (1 + profile.tendance_deces * i) * self._noise('Deces', 0.05, profile, i)
+    
+    def _simulate_birth_rate(self, years, profile=None):
+        """Simule le taux de natalité (pour 1000 habitants)"""
+        profile = self.profile if profile is None else profile
+        i = self._year_index(years)
+        return profile.natalite_base * (1 + profile.tendance_natalite * i) * self._noise('Taux_Natalite', 0.04, profile, i)
+    
+    def _simulate_death_rate(self, years, profile=None):
+        """Simule le taux de mortalité (pour 1000 habitants)"""
+        profile = self.profile if profile is None else profile
+        i = self._year_index(years)
+        return profile.mortalite_base * (1 + profile.tendance_mortalite * i) * self._noise('Taux_Mortalite', 0.03, profile, i)
+    
+    def _simulate_hdi(self, years, profile=None):
+        """Simule l'Indice de Développement Humain"""
+        profile = self.profile if profile is None else profile
+        i = self._year_index(years)
+        # Ne pas dépasser 0.95 (plafond réaliste)
+        hdi = np.minimum(profile.idh_base * (1 + profile.tendance_idh * i), 0.95)
+        return hdi * self._noise('IDH', 0.01, profile, i)
+    
+    def _simulate_life_expectancy(self, years, profile=None):
+        """Simule l'espérance de vie"""
+        profile = self.profile if profile is None else profile
+        i = self._year_index(years)
+        # Amélioration générale de l'espérance de vie, plafonnée à 85 ans
+        expectancy = np.minimum(profile.esperance_vie_base * (1 + 0.002 * i), 85)
+        return expectancy * self._noise('Esperance_Vie', 0.005, profile, i)
+    
+    def _simulate_migration_balance(self, years, profile=None):
         """Simule le solde migratoire"""
-        balance = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Solde migratoire variable selon les territoires
-            if self.territoire in ["Mayotte", "Guyane"]:
-                base_balance = 2000  # Solde positif important
-                trend = 1 - 0.02 * i  # Diminution progressive
-            elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                base_balance = 500  # Solde positif modéré
-                trend = 1 - 0.01 * i  # Légère diminution
-            elif self.territoire == "Saint-Pierre-et-Miquelon":
-                base_balance = -100  # Solde négatif
-                trend = 1 - 0.005 * i  # Légère amélioration
-            else:
-                base_balance = 800  # Solde positif modéré
-                trend = 1 - 0.015 * i  # Diminution progressive
-            
-            noise = np.random.normal(1, 0.2)
-            balance.append(base_balance * trend * noise)
-        
-        return balance
+        profile = self.profile if profile is None else profile
+        i = self._year_index(years)
+        return (profile.solde_migratoire_base * (1 + profile.tendance_migration * i) *
+                self._noise('Solde_Migratoire', 0.2, profile, i))
     
-    def _simulate_young_population(self, dates):
+    def _simulate_young_population(self, years, profile=None):
         """Simule la part des moins de 20 ans"""
-        # Part de base selon le territoire
-        if self.territoire == "Mayotte":
-            base_part = 0.55  # Très jeune population
-        elif self.territoire == "Guyane":
-            base_part = 0.45  # Jeune population
-        elif self.territoire in ["Martinique", "Guadeloupe"]:
-            base_part = 0.28  # Population vieillissante
-        elif self.territoire == "Saint-Pierre-et-Miquelon":
-            base_part = 0.22  # Population âgée
-        else:
-            base_part = 0.32  # Situation intermédiaire
-        
-        parts = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution différente selon les territoires
-            if self.territoire in ["Mayotte", "Guyane"]:
-                trend = 1 - 0.008 * i  # Légère baisse (transition démographique)
-            elif self.territoire in ["Martinique", "Guadeloupe"]:
-                trend = 1 - 0.01 * i  # Baisse plus marquée
-            else:
-                trend = 1 - 0.009 * i  # Baisse modérée
-            
-            noise = np.random.normal(1, 0.02)
-            parts.append(base_part * trend * noise)
-        
-        return parts
+        profile = self.profile if profile is None else profile
+        i = self._year_index(years)
+        return profile.part_jeunes_base * (1 + profile.tendance_jeunes * i) * self._noise('Part_Moins_20_Ans', 0.02, profile, i)
     
-    def _simulate_elderly_population(self, dates):
+    def _simulate_elderly_population(self, years, profile=None):
         """Simule la part des plus de 60 ans"""
-        # Part de base selon le territoire
-        if self.territoire in ["Martinique", "Guadeloupe"]:
-            base_part = 0.25  # Population vieillissante
-        elif self.territoire == "Saint-Pierre-et-Miquelon":
-            base_part = 0.28  # Population âgée
-        elif self.territoire in ["Mayotte", "Guyane"]:
-            base_part = 0.08  # Population jeune
-        else:
-            base_part = 0.18  # Situation intermédiaire
-        
-        parts = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution différente selon les territoires
-            if self.territoire in ["Martinique", "Guadeloupe"]:
-                trend = 1 + 0.012 * i  # Augmentation rapide
-            elif self.territoire == "Saint-Pierre-et-Miquelon":
-                trend = 1 + 0.015 * i  # Augmentation très rapide
-            elif self.territoire in ["Mayotte", "Guyane"]:
-                trend = 1 + 0.01 * i  # Augmentation modérée
-            else:
-                trend = 1 + 0.011 * i  # Augmentation modérée
-            
-            noise = np.random.normal(1, 0.02)
-            parts.append(base_part * trend * noise)
-        
-        return parts
+        profile = self.profile if profile is None else profile
+        i = self._year_index(years)
+        return profile.part_seniors_base * (1 + profile.tendance_seniors * i) * self._noise('Part_Plus_60_Ans', 0.02, profile, i)
     
-    def _simulate_unemployment(self, dates):
-        """Simule le taux de chômage"""
-        # Taux de base selon le territoire
-        if self.territoire in ["Mayotte", "Guyane"]:
-            base_rate = 0.22  # Chômage élevé
-        elif self.territoire in ["Martinique", "Guadeloupe"]:
-            base_rate = 0.18  # Chômage important
-        elif self.territoire == "Saint-Barthélemy":
-            base_rate = 0.08  # Faible chômage
+    def _project_cohorts(self, years, profile, migration, fertility_factor=1.0, mortality_factor=1.0):
+        """Projection par composantes : une cohorte par âge, un pas de Leslie par année.
+        Les matrices sont empilées par territoire (matrices × âges × âges) et appliquées
+        d'un seul np.matmul à toutes les répliques (matrices × âges × répliques)"""
+        i = self._year_index(years)
+        n_rows = np.size(profile.population_base)
+        stacked = np.ndim(profile.territoire) > 0 or any(
+            np.ptp(np.ravel(getattr(profile, key))) > 0 for key in COHORT_PARAMETERS)
+        # Un profil empilé (ou un balayage de paramètres) a une matrice par ligne ; un
+        # profil diffusé sur des répliques partage la même matrice, les répliques
+        # devenant des colonnes
+        n_mat, n_rep = (n_rows, 1) if stacked else (1, n_rows)
+        
+        def per_matrix(param):
+            return np.ravel(param)[:n_mat]
+        
+        def per_year(values):
+            return np.broadcast_to(values, (n_rows, len(years))).reshape(n_mat, n_rep, len(years))
+        
+        ages, mortality, fertility, migration_shape = _age_schedules()
+        pyramid = _initial_pyramid(per_matrix(profile.part_jeunes_base), per_matrix(profile.part_seniors_base))
+        
+        # Calage sur les taux bruts de l'année de base : mortalité et fécondité par âge
+        mortality_level = per_matrix(profile.mortalite_base) / 1000 / (pyramid @ mortality)
+        fertility_level = per_matrix(profile.natalite_base) / 1000 / (pyramid @ fertility)
+        
+        if i[0] == 0:
+            population = np.repeat((pyramid * per_matrix(profile.population_base)[:, None])[..., None],
+                                   n_rep, axis=2)
+        elif self._cohort_state is not None and self._cohort_state[0] == i[0]:
+            # Suite d'une projection en cours (génération par blocs)
+            population = self._cohort_state[1]
         else:
-            base_rate = 0.12  # Situation intermédiaire
-        
-        rates = []
-        for i, date in enumerate(dates):
-            year = date.year
+            raise ValueError("La projection par cohortes doit reprendre à l'année suivant le dernier bloc")
+        
+        birth_noise = per_year(self._noise('Naissances', 0.02, profile, i))
+        death_noise = per_year(self._noise('Deces', 0.02, profile, i))
+        migration = per_year(migration)
+        fertility_factor = per_year(fertility_factor)[:, 0]
+        mortality_factor = per_year(mortality_factor)[:, 0]
+        
+        shape = (n_mat, n_rep, len(years))
+        results = {key: np.empty(shape) for key in ['Population', 'Naissances', 'Deces', 'Solde_Migratoire',
+                                                      'Part_Moins_20_Ans', 'Part_Plus_60_Ans']}
+        leslie = np.zeros((n_mat, AGE_MAX + 1, AGE_MAX + 1))
+        below = np.arange(AGE_MAX)
+        
+        for t, index in enumerate(i):
+            total = population.sum(axis=1)
+            inhabited = np.maximum(total, 1e-12)  # territoire vidé par l'émigration : parts nulles
+            results['Population'][..., t] = total
+            results['Part_Moins_20_Ans'][..., t] = population[:, :20].sum(axis=1) / inhabited
+            results['Part_Plus_60_Ans'][..., t] = population[:, 60:].sum(axis=1) / inhabited
             
-            # Évolution avec des variations cycliques
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 1.15
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes plus favorables
-                multiplier = 0.92
-            else:
-                multiplier = 1.0
+            # Matrice de Leslie de l'année : fécondité en première ligne,
+            # survie sur la sous-diagonale, dernier groupe d'âge ouvert
+            deaths = 1 - np.exp(-np.minimum(mortality_level[:, None] * mortality_factor[:, t, None] *
+                                            mortality, 50))
+            # (tendance de fécondité composée : elle ne s'annule pas sur un siècle)
+            leslie[:, 0, :] = (fertility_level * (1 + per_matrix(profile.tendance_natalite)) ** index *
+                               fertility_factor[:, t])[:, None] * fertility
+            leslie[:, below + 1, below] = 1 - deaths[:, :-1]
+            leslie[:, AGE_MAX, AGE_MAX] = 1 - deaths[:, -1]
             
-            # Tendances à long terme
-            if self.territoire in ["Mayotte", "Guyane"]:
-                trend = 1 - 0.005 * i  # Légère amélioration
-            elif self.territoire in ["Martinique", "Guadeloupe"]:
-                trend = 1 - 0.004 * i  # Légère amélioration
-            else:
-                trend = 1 - 0.003 * i  # Très légère amélioration
+            projected = np.matmul(leslie, population)
             
-            noise = np.random.normal(1, 0.05)
-            rates.append(base_rate * trend * multiplier * noise)
-        
-        return rates
+            # Aléas des naissances et des décès autour des valeurs attendues ; les
+            # décès d'une cohorte ne dépassent jamais son effectif
+            died = np.minimum(deaths[..., None] * death_noise[:, None, :, t], 1) * population
+            extra_deaths = died - deaths[..., None] * population
+            projected[:, 0] *= birth_noise[..., t]
+            projected[:, 1:] -= extra_deaths[:, :-1]
+            projected[:, -1] -= extra_deaths[:, -1]
+            results['Naissances'][..., t] = projected[:, 0]
+            results['Deces'][..., t] = died.sum(axis=1)
+            
+            # Arrivées réparties selon le profil par âge des migrants ; les départs
+            # suivent ce profil en proportion des effectifs de chaque âge, avec un
+            # taux plafonné par cohorte : seul le solde réellement appliqué est retenu
+            net = migration[:, None, :, t]
+            exposure = migration_shape[:, None] * projected
+            departure_rate = np.minimum(-net * migration_shape[:, None] /
+                                        np.maximum(exposure.sum(axis=1, keepdims=True), 1e-12),
+                                        TAUX_DEPART_MAX)
+            applied = np.where(net < 0, -departure_rate * projected, net * migration_shape[:, None])
+            results['Solde_Migratoire'][..., t] = applied.sum(axis=1)
+            population = projected + applied
+        
+        self._cohort_state = (i[-1] + 1, population)
+        
+        inhabited = np.maximum(results['Population'], 1e-12)
+        results['Taux_Natalite'] = results['Naissances'] / inhabited * 1000
+        results['Taux_Mortalite'] = results['Deces'] / inhabited * 1000
+        output_shape = np.broadcast_shapes(np.shape(profile.population_base), i.shape)
+        return {key: values.reshape(output_shape) for key, values in results.items()}
+    
+    def _cyclical_multiplier(self, years, crisis, boom):
+        """Multiplicateur conjoncturel : crises (2008-2009, 2020-2021) et périodes fastes"""
+        years = np.floor(years)
+        return np.select([np.isin(years, [2008, 2009, 2020, 2021]),
+                          np.isin(years, [2006, 2012, 2017, 2023])],
+                         [crisis, boom], default=1.0)
+    
+    def _simulate_unemployment(self, years, profile=None):
+        """Simule le taux de chômage"""
+        profile = self.profile if profile is None else profile
+        i = self._year_index(years)
+        # Évolution avec des variations cycliques
+        multiplier = self._cyclical_multiplier(years, crisis=1.15, boom=0.92)
+        return (profile.chomage_base * (1 + profile.tendance_chomage * i) * multiplier *
+                self._noise('Taux_Chomage', 0.05, profile, i))
     
-    def _simulate_gdp_per_capita(self, dates):
+    def _simulate_gdp_per_capita(self, years, profile=None):
         """Simule le PIB par habitant (en milliers d'euros)"""
-        # PIB de base selon le territoire
-        if self.territoire == "Saint-Barthélemy":
-            base_gdp = 35.0  # PIB très élevé
-        elif self.territoire == "Nouvelle-Calédonie":
-            base_gdp = 28.5  # PIB élevé (nickel)
-        elif self.territoire in ["Martinique", "Guadeloupe"]:
-            base_gdp = 22.0  # PIB moyen-élevé
-        elif self.territoire == "Mayotte":
-            base_gdp = 8.5  # PIB faible
-        elif self.territoire == "Guyane":
-            base_gdp = 15.5  # PIB moyen-faible
-        else:
-            base_gdp = 18.0  # PIB moyen
-        
-        gdp_values = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance différente selon les territoires
-            if self.territoire == "Nouvelle-Calédonie":
-                growth = 1 + 0.018 * i  # Croissance soutenue
-            elif self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.022 * i  # Croissance forte
-            elif self.territoire in ["Martinique", "Guadeloupe"]:
-                growth = 1 + 0.012 * i  # Croissance modérée
-            else:
-                growth = 1 + 0.015 * i  # Croissance modérée
-            
-            # Variations cycliques
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 0.95
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 1.06
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.04)
-            gdp_values.append(base_gdp * growth * multiplier * noise)
-        
-        return gdp_values
+        profile = self.profile if profile is None else profile
+        i = self._year_index(years)
+        # Variations cycliques
+        multiplier = self._cyclical_multiplier(years, crisis=0.95, boom=1.06)
+        return (profile.pib_base * (1 + profile.tendance_pib * i) * multiplier *
+                self._noise('PIB_Par_Habitant', 0.04, profile, i))
+    
+    def _derive_growth_rate(self, data):
+        """Calcule le taux de croissance annuel de la population (%)"""
+        population = data['Population']
+        rate = np.full(np.shape(population), np.nan)
+        rate[..., 1:] = np.diff(population, axis=-1) / population[..., :-1] * 100
+        return rate
+    
+    def _derive_natural_balance(self, data):
+        """Calcule le solde naturel (naissances - décès)"""
+        return data['Naissances'] - data['Deces']
+    
+    def _derive_working_age_share(self, data):
+        """Calcule la part des 20-60 ans"""
+        return 1 - data['Part_Moins_20_Ans'] - data['Part_Plus_60_Ans']
     
     def _add_territory_trends(self, df):
         """Ajoute des tendances réalistes adaptées à chaque territoire"""
-        for i, row in df.iterrows():
-            year = row['Annee']
-            
-            # Événements communs à tous les territoires
-            if 2008 <= year <= 2009:  # Crise financière mondiale
-                df.loc[i, 'Taux_Chomage'] *= 1.12
-                df.loc[i, 'PIB_Par_Habitant'] *= 0.96
-            
-            if 2020 <= year <= 2021:  # Pandémie COVID-19
-                df.loc[i, 'Taux_Mortalite'] *= 1.08
-                df.loc[i, 'PIB_Par_Habitant'] *= 0.92
-                df.loc[i, 'Taux_Chomage'] *= 1.15
-            
-            # Événements spécifiques à certains territoires
-            if self.territoire == "Mayotte":
-                if year >= 2011:  # Départementalisation
-                    df.loc[i, 'IDH'] *= 1.01
-                    df.loc[i, 'PIB_Par_Habitant'] *= 1.02
-            
-            if self.territoire == "Guyane":
-                if year in [2017, 2018]:  # Mouvements sociaux
-                    df.loc[i, 'PIB_Par_Habitant'] *= 0.97
-                    df.loc[i, 'Taux_Chomage'] *= 1.08
+        with self._stage('evenements', len(df)):
+            territories = df['Territoire'].to_numpy() if 'Territoire' in df.columns else None
+            times = df['Annee'].to_numpy()
+            if 'Mois' in df.columns:
+                times = times + (df['Mois'].to_numpy() - 1) / 12
+            multipliers = self._event_multipliers(times, territories, df.columns)
+            for column, multiplier in multipliers.items():
+                df[column] = df[column].to_numpy() * multiplier
+    
+    def _event_multipliers(self, years, territories=None, columns=None):
+        """Combine en un seul passage les événements du tableau en multiplicateurs par colonne"""
+        years = np.asarray(years)
+        territories = np.asarray(self.territoire if territories is None else territories)
+        shape = np.broadcast_shapes(years.shape, territories.shape)
+        
+        multipliers = {}
+        for targets, first_year, last_year, column, factor in self.evenements:
+            if columns is not None and column not in columns:
+                continue
             
-            if self.territoire == "Nouvelle-Calédonie":
-                if year in [2018, 2020, 2021]:  # Référendums et incertitudes politiques
-                    df.loc[i, 'Solde_Migratoire'] *= 0.8
-                    df.loc[i, 'PIB_Par_Habitant'] *= 0.98
+            active = years >= _event_bound(first_year)
+            if last_year is not None:
+                active = active & (years < _event_bound(last_year, end=True))
+            if targets is not None:
+                active = active & np.isin(territories, targets)
             
-            if self.territoire == "La Réunion":
-                if year >= 2010:  # Développement du numérique
-                    df.loc[i, 'IDH'] *= 1.005
-                    df.loc[i, 'PIB_Par_Habitant'] *= 1.01
-    
-    def create_demographic_analysis(self, df):
-        """Crée une analyse complète des indicateurs démographiques"""
-        plt.style.use('seaborn-v0_8')
-        fig = plt.figure(figsize=(20, 24))
-        
-        # 1. Évolution de la population
-        ax1 = plt.subplot(4, 2, 1)
-        self._plot_population_evolution(df, ax1)
-        
-        # 2. Natalité et mortalité
-        ax2 = plt.subplot(4, 2, 2)
-        self._plot_birth_death_rates(df, ax2)
-        
-        # 3. Structure par âge
-        ax3 = plt.subplot(4, 2, 3)
-        self._plot_age_structure(df, ax3)
+            current = multipliers.get(column, np.ones(shape))
+            multipliers[column] = np.where(active, current * factor, current)
         
-        # 4. Indice de développement humain
-        ax4 = plt.subplot(4, 2, 4)
-        self._plot_hdi_evolution(df, ax4)
-        
-        # 5. Solde naturel et migratoire
-        ax5 = plt.subplot(4, 2, 5)
-        self._plot_balances(df, ax5)
+        return multipliers
+    
+    def export_data(self, df, output_dir='.', fmt='csv', compression=None, float32=False):
+        """Sauvegarde le jeu de données et retourne le chemin du fichier"""
+        path = os.path.join(output_dir, f'{self.territoire}_demographic_data_'
+                                        f'{self.start_year}_{self.end_year}.{fmt}')
+        with self._stage(f'export_{fmt}', len(df)):
+            return write_frame(df, path, fmt, compression, float32)
+    
+    def create_demographic_analysis(self, df, ensemble=None, output_dir='.', show=True,
+                                    dpi=300, fmt='png', insights=True):
+        """Crée une analyse complète des indicateurs démographiques (avec bandes d'incertitude si un ensemble est fourni)"""
+        if fmt not in RENDER_FORMATS:
+            raise ValueError(f"Format de graphique inconnu: {fmt}")
+        
+        with _dashboard_style():
+            # Sans affichage, la figure est autonome (rendu Agg) : pyplot ne la
+            # référence pas et elle est libérée dès la fin de la méthode
+            with self._stage('mise_en_page', len(df)):
+                fig = _new_figure(show)
+                self._build_dashboard(fig, df, ensemble)
+                fig.tight_layout()
+            
+            output_file = os.path.join(output_dir, f'{self.territoire}_demographic_analysis.{fmt}')
+            with self._stage(f'savefig_{fmt}_{dpi}dpi'):
+                fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
         
-        # 6. Espérance de vie
-        ax6 = plt.subplot(4, 2, 6)
-        self._plot_life_expectancy(df, ax6)
+        if show:
+            import matplotlib.pyplot as plt
+            plt.show()
+            plt.close(fig)
         
-        # 7. Indicateurs économiques
-        ax7 = plt.subplot(4, 2, 7)
-        self._plot_economic_indicators(df, ax7)
+        # Générer les insights
+        if insights:
+            self._generate_demographic_insights(df)
         
-        # 8. Projection démographique
-        ax8 = plt.subplot(4, 2, 8)
-        self._plot_demographic_projection(df, ax8)
+        return output_file
+    
+    def _build_dashboard(self, fig, df, ensemble=None):
+        """Construit les 8 graphiques du tableau de bord et retourne leurs artistes"""
+        artists = {}
+        
+        for position, (method, required, bands) in enumerate(DASHBOARD_PANELS, 1):
+            ax = fig.add_subplot(4, 2, position)
+            missing = [col for col in required if col not in df.columns]
+            if missing:
+                self._plot_unavailable(ax, missing)
+            elif bands:
+                artists.update(getattr(self, method)(df, ax, ensemble))
+            else:
+                artists.update(getattr(self, method)(df, ax))
         
-        plt.suptitle(f'Analyse Démographique de {self.territoire} - DROM-COM ({self.start_year}-{self.end_year})', 
-                    fontsize=16, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig(f'{self.territoire}_demographic_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        artists['titre'] = fig.suptitle(self._dashboard_title(df), fontsize=16, fontweight='bold')
         
-        # Générer les insights
-        self._generate_demographic_insights(df)
+        return artists
+    
+    def _plot_unavailable(self, ax, missing):
+        """Panneau vide lorsque les données ne contiennent pas les indicateurs requis"""
+        ax.text(0.5, 0.5, f"Données indisponibles :\n{', '.join(missing)}", ha='center', va='center',
+                transform=ax.transAxes, fontsize=11, color='gray')
+        ax.set_axis_off()
+    
+    def _dashboard_title(self, df):
+        """Titre du tableau de bord pour la période couverte par les données"""
+        return (f'Analyse Démographique de {self.territoire} - DROM-COM '
+                f'({int(df["Annee"].min())}-{int(df["Annee"].max())})')
+    
+    def _plot_band(self, ax, ensemble, column, color, scale=1):
+        """Trace la bande entre les quantiles extrêmes d'un indicateur de l'ensemble"""
+        if ensemble is None:
+            return None
+        
+        # Colonnes <indicateur>_p<q>, triées par quantile (et non par ordre des colonnes)
+        bounds = sorted((float(col[len(column) + 2:]), col) for col in ensemble.columns
+                        if col.startswith(f'{column}_p') and col[len(column) + 2:].replace('.', '', 1).isdigit())
+        if not bounds:
+            return None
+        return ax.fill_between(ensemble['Annee'], ensemble[bounds[0][1]] * scale, ensemble[bounds[-1][1]] * scale,
+                               color=color, alpha=0.2, linewidth=0)
     
-    def _plot_population_evolution(self, df, ax):
+    def _plot_population_evolution(self, df, ax, ensemble=None):
         """Plot de l'évolution de la population"""
-        ax.plot(df['Annee'], df['Population'], label='Population', 
-               linewidth=2, color='#2A9D8F', alpha=0.8)
+        population, = ax.plot(df['Annee'], df['Population'], label='Population', 
+                              linewidth=2, color='#2A9D8F', alpha=0.8)
+        self._plot_band(ax, ensemble, 'Population', '#2A9D8F')
         
         ax.set_title('Évolution de la Population', fontsize=12, fontweight='bold')
         ax.set_ylabel('Population')
@@ -593,9 +2070,8 @@ class DromcomDemographyAnalyzer:
         
         # Ajouter le taux de croissance en second axe
         ax2 = ax.twinx()
-        growth_rates = df['Population'].pct_change() * 100
-        ax2.plot(df['Annee'][1:], growth_rates[1:], label='Taux de croissance (%)', 
-                linewidth=2, color='#E76F51', alpha=0.7, linestyle='--')
+        growth, = ax2.plot(df['Annee'][1:], df['Taux_Croissance'][1:], label='Taux de croissance (%)', 
+                           linewidth=2, color='#E76F51', alpha=0.7, linestyle='--')
         ax2.set_ylabel('Taux de croissance (%)', color='#E76F51')
         ax2.tick_params(axis='y', labelcolor='#E76F51')
         
@@ -603,42 +2079,50 @@ class DromcomDemographyAnalyzer:
         lines1, labels1 = ax.get_legend_handles_labels()
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
+        
+        return {'population': population, 'croissance': growth}
     
-    def _plot_birth_death_rates(self, df, ax):
+    def _plot_birth_death_rates(self, df, ax, ensemble=None):
         """Plot des taux de natalité et mortalité"""
-        ax.plot(df['Annee'], df['Taux_Natalite'], label='Taux de natalité (‰)', 
-               linewidth=2, color='#2A9D8F', alpha=0.8)
-        ax.plot(df['Annee'], df['Taux_Mortalite'], label='Taux de mortalité (‰)', 
-               linewidth=2, color='#E76F51', alpha=0.8)
+        birth_rate, = ax.plot(df['Annee'], df['Taux_Natalite'], label='Taux de natalité (‰)', 
+                              linewidth=2, color='#2A9D8F', alpha=0.8)
+        death_rate, = ax.plot(df['Annee'], df['Taux_Mortalite'], label='Taux de mortalité (‰)', 
+                              linewidth=2, color='#E76F51', alpha=0.8)
+        self._plot_band(ax, ensemble, 'Taux_Natalite', '#2A9D8F')
+        self._plot_band(ax, ensemble, 'Taux_Mortalite', '#E76F51')
         
         ax.set_title('Taux de Natalité et Mortalité (pour 1000 habitants)', 
                     fontsize=12, fontweight='bold')
         ax.set_ylabel('Taux (‰)')
         ax.legend()
         ax.grid(True, alpha=0.3)
+        
+        return {'natalite': birth_rate, 'mortalite': death_rate}
     
-    def _plot_age_structure(self, df, ax):
+    def _plot_age_structure(self, df, ax, ensemble=None):
         """Plot de la structure par âge"""
-        ax.plot(df['Annee'], df['Part_Moins_20_Ans'] * 100, label='Moins de 20 ans (%)', 
-               linewidth=2, color='#2A9D8F', alpha=0.8)
-        ax.plot(df['Annee'], df['Part_Plus_60_Ans'] * 100, label='Plus de 60 ans (%)', 
-               linewidth=2, color='#E76F51', alpha=0.8)
+        young, = ax.plot(df['Annee'], df['Part_Moins_20_Ans'] * 100, label='Moins de 20 ans (%)', 
+                         linewidth=2, color='#2A9D8F', alpha=0.8)
+        elderly, = ax.plot(df['Annee'], df['Part_Plus_60_Ans'] * 100, label='Plus de 60 ans (%)', 
+                           linewidth=2, color='#E76F51', alpha=0.8)
+        self._plot_band(ax, ensemble, 'Part_Moins_20_Ans', '#2A9D8F', scale=100)
+        self._plot_band(ax, ensemble, 'Part_Plus_60_Ans', '#E76F51', scale=100)
         
-        # Calculer la part des 20-60 ans
-        part_20_60 = [100 - (df.loc[i, 'Part_Moins_20_Ans'] * 100 + df.loc[i, 'Part_Plus_60_Ans'] * 100) 
-                      for i in range(len(df))]
-        ax.plot(df['Annee'], part_20_60, label='20-60 ans (%)', 
-               linewidth=2, color='#F9A602', alpha=0.8)
+        working, = ax.plot(df['Annee'], df['Part_20_60_Ans'] * 100, label='20-60 ans (%)', 
+                           linewidth=2, color='#F9A602', alpha=0.8)
         
         ax.set_title('Structure de la Population par Âge', fontsize=12, fontweight='bold')
         ax.set_ylabel('Part de la population (%)')
         ax.legend()
         ax.grid(True, alpha=0.3)
+        
+        return {'moins_20_ans': young, 'plus_60_ans': elderly, '20_60_ans': working}
     
-    def _plot_hdi_evolution(self, df, ax):
+    def _plot_hdi_evolution(self, df, ax, ensemble=None):
         """Plot de l'évolution de l'IDH"""
-        ax.plot(df['Annee'], df['IDH'], label='IDH', 
-               linewidth=2, color='#2A9D8F', alpha=0.8)
+        hdi, = ax.plot(df['Annee'], df['IDH'], label='IDH', 
+                       linewidth=2, color='#2A9D8F', alpha=0.8)
+        self._plot_band(ax, ensemble, 'IDH', '#2A9D8F')
         
         ax.set_title('Évolution de l\'Indice de Développement Humain (IDH)', 
                     fontsize=12, fontweight='bold')
@@ -650,33 +2134,41 @@ class DromcomDemographyAnalyzer:
         ax.axhline(y=0.8, color='green', linestyle='--', alpha=0.5, label='Développement élevé')
         ax.axhline(y=0.7, color='orange', linestyle='--', alpha=0.5, label='Développement moyen')
         ax.legend()
+        
+        return {'idh': hdi}
     
     def _plot_balances(self, df, ax):
         """Plot des soldes naturel et migratoire"""
-        ax.bar(df['Annee'], df['Solde_Naturel'], label='Solde naturel', 
-              color='#2A9D8F', alpha=0.7)
-        ax.bar(df['Annee'], df['Solde_Migratoire'], label='Solde migratoire', 
-              color='#E76F51', alpha=0.7, bottom=df['Solde_Naturel'])
+        natural = ax.bar(df['Annee'], df['Solde_Naturel'], label='Solde naturel', 
+                         color='#2A9D8F', alpha=0.7)
+        migration = ax.bar(df['Annee'], df['Solde_Migratoire'], label='Solde migratoire', 
+                           color='#E76F51', alpha=0.7, bottom=df['Solde_Naturel'])
         
         ax.set_title('Soldes Naturel et Migratoire', fontsize=12, fontweight='bold')
         ax.set_ylabel('Personnes')
         ax.legend()
         ax.grid(True, alpha=0.3, axis='y')
+        
+        return {'solde_naturel': natural, 'solde_migratoire': migration}
     
-    def _plot_life_expectancy(self, df, ax):
+    def _plot_life_expectancy(self, df, ax, ensemble=None):
         """Plot de l'espérance de vie"""
-        ax.plot(df['Annee'], df['Esperance_Vie'], label='Espérance de vie', 
-               linewidth=2, color='#2A9D8F', alpha=0.8)
+        expectancy, = ax.plot(df['Annee'], df['Esperance_Vie'], label='Espérance de vie', 
+                              linewidth=2, color='#2A9D8F', alpha=0.8)
+        self._plot_band(ax, ensemble, 'Esperance_Vie', '#2A9D8F')
         
         ax.set_title('Évolution de l\'Espérance de Vie', fontsize=12, fontweight='bold')
         ax.set_ylabel('Années')
         ax.grid(True, alpha=0.3)
+        
+        return {'esperance_vie': expectancy}
     
-    def _plot_economic_indicators(self, df, ax):
+    def _plot_economic_indicators(self, df, ax, ensemble=None):
         """Plot des indicateurs économiques"""
         # PIB par habitant
-        ax.plot(df['Annee'], df['PIB_Par_Habitant'], label='PIB par habitant (k€)', 
-               linewidth=2, color='#2A9D8F', alpha=0.8)
+        gdp, = ax.plot(df['Annee'], df['PIB_Par_Habitant'], label='PIB par habitant (k€)', 
+                       linewidth=2, color='#2A9D8F', alpha=0.8)
+        self._plot_band(ax, ensemble, 'PIB_Par_Habitant', '#2A9D8F')
         
         ax.set_title('Indicateurs Économiques', fontsize=12, fontweight='bold')
         ax.set_ylabel('PIB par habitant (k€)', color='#2A9D8F')
@@ -685,8 +2177,9 @@ class DromcomDemographyAnalyzer:
         
         # Taux de chômage en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Taux_Chomage'] * 100, label='Taux de chômage (%)', 
-                linewidth=2, color='#E76F51', alpha=0.8)
+        unemployment, = ax2.plot(df['Annee'], df['Taux_Chomage'] * 100, label='Taux de chômage (%)', 
+                                 linewidth=2, color='#E76F51', alpha=0.8)
+        self._plot_band(ax2, ensemble, 'Taux_Chomage', '#E76F51', scale=100)
         ax2.set_ylabel('Taux de chômage (%)', color='#E76F51')
         ax2.tick_params(axis='y', labelcolor='#E76F51')
         
@@ -694,6 +2187,8 @@ class DromcomDemographyAnalyzer:
         lines1, labels1 = ax.get_legend_handles_labels()
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
+        
+        return {'pib': gdp, 'chomage': unemployment}
     
     def _plot_demographic_projection(self, df, ax):
         """Plot de la projection démographique"""
@@ -705,76 +2200,58 @@ class DromcomDemographyAnalyzer:
         colors = ['#2A9D8F', '#E76F51']
         labels = ['Moins de 20 ans', 'Plus de 60 ans']
         
-        # Calculer la part des 20-60 ans
-        part_20_60 = [1 - (df.loc[i, 'Part_Moins_20_Ans'] + df.loc[i, 'Part_Plus_60_Ans']) 
-                      for i in range(len(df))]
-        
         # Ajouter les trois catégories
-        ax.bar(years, df['Part_Moins_20_Ans'] * df['Population'], label='Moins de 20 ans', 
-               color='#2A9D8F', alpha=0.7)
-        ax.bar(years, part_20_60 * df['Population'], label='20-60 ans', 
-               color='#F9A602', alpha=0.7, bottom=df['Part_Moins_20_Ans'] * df['Population'])
-        ax.bar(years, df['Part_Plus_60_Ans'] * df['Population'], label='Plus de 60 ans', 
-               color='#E76F51', alpha=0.7, 
-               bottom=(df['Part_Moins_20_Ans'] * df['Population'] + 
-                       np.array(part_20_60) * df['Population']))
+        young = ax.bar(years, df['Part_Moins_20_Ans'] * df['Population'], label='Moins de 20 ans', 
+                       color='#2A9D8F', alpha=0.7)
+        working = ax.bar(years, df['Part_20_60_Ans'] * df['Population'], label='20-60 ans', 
+                         color='#F9A602', alpha=0.7, bottom=df['Part_Moins_20_Ans'] * df['Population'])
+        elderly = ax.bar(years, df['Part_Plus_60_Ans'] * df['Population'], label='Plus de 60 ans', 
+                         color='#E76F51', alpha=0.7, 
+                         bottom=(df['Part_Moins_20_Ans'] + df['Part_20_60_Ans']) * df['Population'])
         
         ax.set_title('Projection Démographique par Tranche d\'Âge', fontsize=12, fontweight='bold')
         ax.set_ylabel('Population')
         ax.legend()
         ax.grid(True, alpha=0.3, axis='y')
+        
+        return {'effectif_moins_20_ans': young, 'effectif_20_60_ans': working,
+                'effectif_plus_60_ans': elderly}
     
     def _generate_demographic_insights(self, df):
         """Génère des insights analytiques adaptés au territoire"""
+        insights = compute_insights(df, self.territoire)
+        
         print(f"🏝️ INSIGHTS DÉMOGRAPHIQUES - {self.territoire} (DROM-COM)")
         print("=" * 60)
         
         # 1. Statistiques de base
         print("\n1. 📈 STATISTIQUES GÉNÉRALES:")
-        avg_population = df['Population'].mean()
-        avg_birth_rate = df['Taux_Natalite'].mean()
-        avg_death_rate = df['Taux_Mortalite'].mean()
-        avg_hdi = df['IDH'].mean()
-        
-        print(f"Population moyenne: {avg_population:,.0f} habitants")
-        print(f"Taux de natalité moyen: {avg_birth_rate:.1f} ‰")
-        print(f"Taux de mortalité moyen: {avg_death_rate:.1f} ‰")
-        print(f"IDH moyen: {avg_hdi:.3f}")
+        print(f"Population moyenne: {_format_insight(insights.population_moyenne, ',.0f')} habitants")
+        print(f"Taux de natalité moyen: {_format_insight(insights.taux_natalite_moyen, '.1f')} ‰")
+        print(f"Taux de mortalité moyen: {_format_insight(insights.taux_mortalite_moyen, '.1f')} ‰")
+        print(f"IDH moyen: {_format_insight(insights.idh_moyen, '.3f')}")
         
         # 2. Croissance démographique
         print("\n2. 📊 ÉVOLUTION DÉMOGRAPHIQUE:")
-        population_growth = ((df['Population'].iloc[-1] / 
-                             df['Population'].iloc[0]) - 1) * 100
-        natural_balance = df['Solde_Naturel'].mean()
-        migration_balance = df['Solde_Migratoire'].mean()
-        
-        print(f"Croissance de la population ({self.start_year}-{self.end_year}): {population_growth:.1f}%")
-        print(f"Solde naturel moyen: {natural_balance:.0f} personnes/an")
-        print(f"Solde migratoire moyen: {migration_balance:.0f} personnes/an")
+        print(f"Croissance de la population ({self.start_year}-{self.end_year}): {_format_insight(insights.croissance_population, '.1f')}%")
+        print(f"Solde naturel moyen: {_format_insight(insights.solde_naturel_moyen, '.0f')} personnes/an")
+        print(f"Solde migratoire moyen: {_format_insight(insights.solde_migratoire_moyen, '.0f')} personnes/an")
         
         # 3. Structure par âge
         print("\n3. 👥 STRUCTURE PAR ÂGE:")
-        young_share = df['Part_Moins_20_Ans'].mean() * 100
-        elderly_share = df['Part_Plus_60_Ans'].mean() * 100
-        working_share = 100 - young_share - elderly_share
-        
-        print(f"Part des moins de 20 ans: {young_share:.1f}%")
-        print(f"Part des 20-60 ans: {working_share:.1f}%")
-        print(f"Part des plus de 60 ans: {elderly_share:.1f}%")
+        print(f"Part des moins de 20 ans: {_format_insight(insights.part_moins_20_ans, '.1f')}%")
+        print(f"Part des 20-60 ans: {_format_insight(insights.part_20_60_ans, '.1f')}%")
+        print(f"Part des plus de 60 ans: {_format_insight(insights.part_plus_60_ans, '.1f')}%")
         
         # 4. Indicateurs de développement
         print("\n4. 📋 INDICATEURS DE DÉVELOPPEMENT:")
-        life_expectancy = df['Esperance_Vie'].mean()
-        unemployment = df['Taux_Chomage'].mean() * 100
-        gdp_per_capita = df['PIB_Par_Habitant'].mean()
-        
-        print(f"Espérance de vie moyenne: {life_expectancy:.1f} ans")
-        print(f"Taux de chômage moyen: {unemployment:.1f}%")
-        print(f"PIB par habitant moyen: {gdp_per_capita:.1f} k€")
+        print(f"Espérance de vie moyenne: {_format_insight(insights.esperance_vie_moyenne, '.1f')} ans")
+        print(f"Taux de chômage moyen: {_format_insight(insights.taux_chomage_moyen, '.1f')}%")
+        print(f"PIB par habitant moyen: {_format_insight(insights.pib_par_habitant_moyen, '.1f')} k€")
         
         # 5. Spécificités du territoire
         print(f"\n5. 🌟 SPÉCIFICITÉS DE {self.territoire.upper()}:")
-        print(f"Spécialités: {', '.join(self.config['specialites'])}")
+        print(f"Spécialités: {', '.join(self.profile.specialites)}")
         
         # 6. Événements marquants
         print("\n6. 📅 ÉVÉNEMENTS MARQUANTS:")
@@ -786,42 +2263,486 @@ class DromcomDemographyAnalyzer:
         
         # 7. Recommandations
         print("\n7. 💡 RECOMMANDATIONS STRATÉGIQUES:")
+        for recommandation in insights.recommandations:
+            print(f"• {recommandation}")
         
-        if young_share > 40:  # Population très jeune
-            print("• Investir massivement dans l'éducation et la formation")
-            print("• Développer des politiques d'emploi pour les jeunes")
-            print("• Créer des infrastructures adaptées à une population jeune")
-        
-        if elderly_share > 25:  # Population vieillissante
-            print("• Adapter le système de santé au vieillissement")
-            print("• Développer les services aux personnes âgées")
-            print("• Favoriser le maintien à domicile")
-        
-        if unemployment > 15:  # Chômage élevé
-            print("• Développer des programmes de formation professionnelle")
-            print("• Soutenir la création d'entreprises et l'entrepreneuriat")
-            print("• Diversifier l'économie pour créer des emplois")
-        
-        if self.territoire in ["Mayotte", "Guyane"]:  # Défis spécifiques
-            print("• Améliorer l'accès aux services de base")
-            print("• Développer les infrastructures de transport")
-            print("• Lutter contre l'habitat informel")
-        
-        if "tourisme" in self.config["specialites"]:
-            print("• Développer un tourisme durable et responsable")
-            print("• Valoriser le patrimoine culturel et naturel")
-            print("• Former les professionnels du tourisme")
+        return insights
 
-def main():
-    """Fonction principale pour les DROM-COM"""
-    # Liste des DROM-COM
-    territoires = [
-        "Guadeloupe", "Martinique", "Guyane", "La Réunion", "Mayotte",
-        "Saint-Martin", "Saint-Barthélemy", "Saint-Pierre-et-Miquelon",
-        "Wallis-et-Futuna", "Polynésie française", "Nouvelle-Calédonie"
+class DemographicArrays:
+    """Résultats compacts : un tableau typé (répliques × territoires × années) par indicateur"""
+    
+    def __init__(self, territories, years, n_replicates=1, columns=None):
+        self.territories = list(territories)
+        self.years = np.asarray(years, dtype=COLUMN_DTYPES['Annee'])
+        self.n_replicates = n_replicates
+        
+        shape = (n_replicates, len(self.territories), len(self.years))
+        self.data = {col: np.empty(shape, dtype=COLUMN_DTYPES.get(col, DEFAULT_COLUMN_DTYPE))
+                     for col in (COLUMN_GRAPH if columns is None else columns)}
+    
+    @property
+    def columns(self):
+        return list(self.data)
+    
+    @property
+    def shape(self):
+        return (self.n_replicates, len(self.territories), len(self.years))
+    
+    @property
+    def nbytes(self):
+        return self.years.nbytes + sum(values.nbytes for values in self.data.values())
+    
+    def __getitem__(self, column):
+        """Tableau (répliques × territoires × années) d'un indicateur, sans copie"""
+        return self.data[column]
+    
+    def fill(self, column, values, replicates=slice(None), territory=slice(None)):
+        """Range des valeurs simulées dans le stockage compact (effectifs arrondis)"""
+        target = self.data[column]
+        if np.issubdtype(target.dtype, np.integer):
+            values = np.rint(values)
+        target[replicates, territory] = values
+    
+    def to_frame(self, territoire=None, replicate=None):
+        """Vue pandas au format long ; les indicateurs partagent la mémoire des tableaux"""
+        replicates = slice(None) if replicate is None else slice(replicate, replicate + 1)
+        territories = (slice(None) if territoire is None else
+                       slice(self.territories.index(territoire), self.territories.index(territoire) + 1))
+        names = self.territories[territories]
+        n_rep = len(range(self.n_replicates)[replicates])
+        
+        data = {}
+        if self.n_replicates > 1 and replicate is None:
+            data['Replique'] = np.repeat(np.arange(n_rep, dtype=np.int32), len(names) * len(self.years))
+        if territoire is None:
+            codes = np.tile(np.repeat(np.arange(len(names), dtype=np.int16), len(self.years)), n_rep)
+            data['Territoire'] = pd.Categorical.from_codes(codes, categories=names)
+        data['Annee'] = np.tile(self.years, n_rep * len(names))
+        
+        # Les tranches contiguës s'aplatissent en vues : aucune copie des indicateurs
+        data.update({col: values[replicates, territories].reshape(-1)
+                     for col, values in self.data.items()})
+        return pd.DataFrame(data, copy=False)
+
+class DemographicDashboard:
+    """Tableau de bord persistant : la mise en page est construite une seule fois,
+    chaque nouveau jeu de données ne met à jour que les données des artistes"""
+    
+    # Bandes d'incertitude : (courbe associée, colonne de l'ensemble, échelle)
+    BANDS = [
+        ('population', 'Population', 1),
+        ('natalite', 'Taux_Natalite', 1),
+        ('mortalite', 'Taux_Mortalite', 1),
+        ('moins_20_ans', 'Part_Moins_20_Ans', 100),
+        ('plus_60_ans', 'Part_Plus_60_Ans', 100),
+        ('idh', 'IDH', 1),
+        ('esperance_vie', 'Esperance_Vie', 1),
+        ('pib', 'PIB_Par_Habitant', 1),
+        ('chomage', 'Taux_Chomage', 100),
     ]
     
-    print("🏝️ ANALYSE DÉMOGRAPHIQUE DES DROM-COM (2002-2025)")
+    def __init__(self, analyzer, df, ensemble=None, interactive=False):
+        self.analyzer = analyzer
+        self.interactive = interactive
+        self._bands = []
+        
+        with _dashboard_style():
+            self.fig = _new_figure(interactive)
+            self.artists = analyzer._build_dashboard(self.fig, df)
+            self.fig.tight_layout()
+        self._n_years = len(df)
+        self._panels = _available_panels(df)
+        
+        self._update_bands(ensemble)
+    
+    def update(self, df, ensemble=None):
+        """Remplace les données affichées sans reconstruire la figure"""
+        panels = _available_panels(df)
+        if len(df) != self._n_years or panels != self._panels or not all(panels):
+            # Le nombre de barres ou les panneaux disponibles changent : seule une reconstruction
+            # convient ; avec des données partielles, elle trace directement les panneaux disponibles
+            self._rebuild(df)
+            if not all(panels):
+                self._update_bands(ensemble)
+                return
+        
+        a = self.artists
+        years = df['Annee'].to_numpy()
+        
+        a['population'].set_data(years, df['Population'])
+        a['croissance'].set_data(years[1:], df['Taux_Croissance'].to_numpy()[1:])
+        a['natalite'].set_data(years, df['Taux_Natalite'])
+        a['mortalite'].set_data(years, df['Taux_Mortalite'])
+        a['moins_20_ans'].set_data(years, df['Part_Moins_20_Ans'] * 100)
+        a['plus_60_ans'].set_data(years, df['Part_Plus_60_Ans'] * 100)
+        a['20_60_ans'].set_data(years, df['Part_20_60_Ans'] * 100)
+        a['idh'].set_data(years, df['IDH'])
+        a['esperance_vie'].set_data(years, df['Esperance_Vie'])
+        a['pib'].set_data(years, df['PIB_Par_Habitant'])
+        a['chomage'].set_data(years, df['Taux_Chomage'] * 100)
+        
+        # Barres empilées : hauteurs et bases
+        natural = df['Solde_Naturel'].to_numpy()
+        self._update_bars(a['solde_naturel'], years, natural)
+        self._update_bars(a['solde_migratoire'], years, df['Solde_Migratoire'].to_numpy(), natural)
+        
+        population = df['Population'].to_numpy()
+        young = df['Part_Moins_20_Ans'].to_numpy() * population
+        working = df['Part_20_60_Ans'].to_numpy() * population
+        self._update_bars(a['effectif_moins_20_ans'], years, young)
+        self._update_bars(a['effectif_20_60_ans'], years, working, young)
+        self._update_bars(a['effectif_plus_60_ans'], years,
+                          df['Part_Plus_60_Ans'].to_numpy() * population, young + working)
+        
+        a['titre'].set_text(self.analyzer._dashboard_title(df))
+        self._update_bands(ensemble)
+        
+        # Recalculer les limites des axes (l'axe de l'IDH garde ses limites fixes)
+        for ax in self.fig.axes:
+            ax.relim()
+            ax.autoscale_view()
+        
+        if self.interactive:
+            self.fig.canvas.draw_idle()
+    
+    def save(self, output_dir='.', dpi=300, fmt='png'):
+        """Enregistre l'état courant du tableau de bord"""
+        if fmt not in RENDER_FORMATS:
+            raise ValueError(f"Format de graphique inconnu: {fmt}")
+        
+        output_file = os.path.join(output_dir, f'{self.analyzer.territoire}_demographic_analysis.{fmt}')
+        self.fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
+        return output_file
+    
+    def _update_bars(self, bars, years, heights, bottoms=None):
+        """Met à jour la position, la hauteur et la base de chaque barre"""
+        bottoms = np.zeros(len(heights)) if bottoms is None else bottoms
+        for rect, year, height, bottom in zip(bars, years, heights, bottoms):
+            rect.set_x(year - rect.get_width() / 2)
+            rect.set_height(height)
+            rect.set_y(bottom)
+    
+    def _update_bands(self, ensemble):
+        """Remplace les bandes d'incertitude (aucune si ensemble vaut None)"""
+        for band in self._bands:
+            band.remove()
+        self._bands = []
+        
+        if ensemble is None:
+            return
+        
+        for line_key, column, scale in self.BANDS:
+            line = self.artists.get(line_key)
+            if line is None:
+                continue
+            band = self.analyzer._plot_band(line.axes, ensemble, column, line.get_color(), scale)
+            if band is not None:
+                self._bands.append(band)
+    
+    def _rebuild(self, df):
+        """Reconstruit la mise en page (changement du nombre d'années)"""
+        self.fig.clear()
+        self._bands = []
+        with _dashboard_style():
+            self.artists = self.analyzer._build_dashboard(self.fig, df)
+            self.fig.tight_layout()
+        self._n_years = len(df)
+        self._panels = _available_panels(df)
+
+def generate_panel(territories=None, start_year=2002, end_year=2025, columns=None, seed=None,
+                   model='tendance', freq='Y'):
+    """Génère en un seul passage les données de plusieurs DROM-COM (format long territoire × période)"""
+    territories = list(TERRITOIRES if territories is None else territories)
+    print(f"🏝️ Génération du panel démographique pour {len(territories)} territoires...")
+    
+    analyzer = DromcomDemographyAnalyzer("DROM-COM", start_year, end_year, seed, model)
+    times, years, months = _time_points(start_year, end_year, freq)
+    
+    # Profils de chaque territoire empilés en colonne (territoires × 1),
+    # diffusés sur l'axe des années par les simulateurs
+    profiles = TerritoryProfile.stack([TerritoryProfile.for_territory(t) for t in territories])
+    
+    # Chaque série est une matrice territoires × périodes
+    series = analyzer._simulate_columns(times, profiles, columns, freq)
+    
+    data = {'Territoire': np.repeat(territories, len(times)),
+            'Annee': np.tile(years, len(territories))}
+    if freq != 'Y':
+        data['Mois'] = np.tile(months, len(territories))
+    data.update({col: values.ravel() for col, values in series.items()})
+    
+    return pd.DataFrame(data)
+
+def iter_panel(territories=None, start_year=2002, end_year=2025, batch_size=10, columns=None, seed=None,
+               model='tendance'):
+    """Génère le panel de plusieurs DROM-COM par blocs d'années (format long, comme generate_panel)"""
+    territories = list(TERRITOIRES if territories is None else territories)
+    analyzer = DromcomDemographyAnalyzer("DROM-COM", start_year, end_year, seed, model)
+    profiles = TerritoryProfile.stack([TerritoryProfile.for_territory(t) for t in territories])
+    
+    for years, series in analyzer._iter_blocks(batch_size, profiles, columns):
+        data = {'Territoire': np.repeat(territories, len(years)),
+                'Annee': np.tile(years, len(territories))}
+        data.update({col: values.ravel() for col, values in series.items()})
+        yield pd.DataFrame(data)
+
+def generate_arrays(territories=None, start_year=2002, end_year=2025, n_replicates=1,
+                    chunk_size=10000, columns=None, seed=None, model='tendance'):
+    """Génère des trajectoires (répliques × territoires × années) dans un stockage compact"""
+    territories = list(TERRITOIRES if territories is None else territories)
+    print(f"🎲 Simulation de {n_replicates:,} trajectoires pour {len(territories)} territoires...")
+    
+    analyzer = DromcomDemographyAnalyzer("DROM-COM", start_year, end_year, seed, model)
+    years = np.arange(start_year, end_year + 1)
+    arrays = DemographicArrays(territories, years, n_replicates,
+                               None if columns is None else [c for c in COLUMN_GRAPH if c in columns])
+    analyzer._reset_streams()
+    
+    # Seul un bloc de répliques est simulé en float64 à la fois ; les mêmes flux
+    # que generate_ensemble sont utilisés, territoire par territoire
+    for t, territoire in enumerate(territories):
+        profile = TerritoryProfile.for_territory(territoire)
+        for start in range(0, n_replicates, chunk_size):
+            size = min(chunk_size, n_replicates - start)
+            paths = analyzer._simulate_columns(years, profile.broadcast(size), columns)
+            for col, values in paths.items():
+                arrays.fill(col, values, slice(start, start + size), t)
+    
+    return arrays
+
+def _render_dashboard(territoire, df, output_dir, dpi, fmt, ensemble=None):
+    """Trace sans affichage le tableau de bord d'un territoire (exécuté dans un processus de travail)"""
+    analyzer = DromcomDemographyAnalyzer(territoire, int(df['Annee'].min()), int(df['Annee'].max()))
+    return analyzer.create_demographic_analysis(df, ensemble, output_dir=output_dir, show=False,
+                                                dpi=dpi, fmt=fmt, insights=False)
+
+def render_dashboards(frames, output_dir='.', dpi=300, fmt='png', jobs=1):
+    """Trace les tableaux de bord de plusieurs territoires, en parallèle si jobs > 1"""
+    # Un panel au format long est découpé par territoire
+    if isinstance(frames, pd.DataFrame):
+        frames = {territoire: group.drop(columns='Territoire').reset_index(drop=True)
+                  for territoire, group in frames.groupby('Territoire', sort=False)}
+    os.makedirs(output_dir, exist_ok=True)
+    
+    if jobs > 1 and len(frames) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_render_dashboard, territoire, df, output_dir, dpi, fmt)
+                       for territoire, df in frames.items()]
+            return [future.result() for future in futures]
+    
+    return [_render_dashboard(territoire, df, output_dir, dpi, fmt) for territoire, df in frames.items()]
+
+def _run_territory(territoire, args):
+    """Génère, exporte et trace un territoire ; retourne la durée de chaque étape"""
+    timings = {}
+    
+    start = time.perf_counter()
+    analyzer = DromcomDemographyAnalyzer(territoire, args.start_year, args.end_year, args.seed, args.model)
+    if args.trace or args.trace_memory or args.profile_stage:
+        analyzer.enable_tracing(args.profile_stage, args.trace_memory)
+    if args.batch_size:
+        timings = _stream_territory(analyzer, args)
+        _write_trace(analyzer, args)
+        return territoire, timings
+    if args.source:
+        demographic_data = _load_source(args, territoire)
+        analyzer.start_year, analyzer.end_year = (int(demographic_data['Annee'].min()),
+                                                  int(demographic_data['Annee'].max()))
+    else:
+        demographic_data = analyzer.generate_demographic_data(use_cache=True, freq=args.freq)
+    timings['generation'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    if args.partitioned:
+        writer = PartitionedWriter(os.path.join(args.out_dir, 'demographic_data'), args.format,
+                                   args.compression, args.float32, 'append' if args.append else 'overwrite')
+        output_file = writer.write(demographic_data, territoire)[0]
+    else:
+        output_file = analyzer.export_data(demographic_data, args.out_dir, args.format,
+                                           args.compression, args.float32)
+    print(f"💾 Données sauvegardées: {output_file}")
+    if args.insights_json:
+        insights_to_json(compute_insights(demographic_data, territoire),
+                         os.path.join(args.out_dir, f'{territoire}_insights.json'))
+    timings['export'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    if not args.no_plot:
+        analyzer.create_demographic_analysis(demographic_data, output_dir=args.out_dir, show=False,
+                                             dpi=args.dpi, fmt=args.plot_format)
+    timings['rendu'] = time.perf_counter() - start
+    
+    _write_trace(analyzer, args)
+    return territoire, timings
+
+def _load_source(args, territoire):
+    """Charge les séries officielles d'un territoire avec les options de lecture de la ligne de commande"""
+    sheet = args.source_sheet
+    return load_official_data(args.source, territoire, sheet_name=int(sheet) if sheet and sheet.isdigit() else sheet,
+                              sep=args.source_sep, decimal=args.source_decimal)
+
+def _write_trace(analyzer, args):
+    """Écrit la trace JSON des étapes d'un territoire si le traçage est actif, puis l'arrête"""
+    if analyzer.tracer is not None:
+        path = analyzer.tracer.write(os.path.join(args.out_dir, f'{analyzer.territoire}_trace.json'))
+        analyzer.tracer.close()
+        print(f"🔎 Trace des étapes: {path}")
+
+def _stream_territory(analyzer, args):
+    """Génère et écrit un territoire bloc par bloc dans des partitions ; retourne les durées"""
+    writer = PartitionedWriter(os.path.join(args.out_dir, 'demographic_data'), args.format,
+                               args.compression, args.float32, 'append' if args.append else 'overwrite')
+    timings = {'generation': 0.0, 'export': 0.0, 'rendu': 0.0}
+    blocks = analyzer.iter_batches(args.batch_size)
+    
+    while True:
+        start = time.perf_counter()
+        block = next(blocks, None)
+        timings['generation'] += time.perf_counter() - start
+        if block is None:
+            break
+        
+        start = time.perf_counter()
+        writer.write(block, analyzer.territoire)
+        timings['export'] += time.perf_counter() - start
+    
+    print(f"💾 Données de {analyzer.territoire} écrites par blocs de {args.batch_size} ans "
+          f"dans {writer.output_dir}")
+    return timings
+
+def run_batch(territories, args):
+    """Traite plusieurs territoires, en parallèle si args.jobs > 1, puis affiche le bilan des durées"""
+    os.makedirs(args.out_dir, exist_ok=True)
+    
+    if args.source:
+        # Les fichiers officiels ne couvrent souvent qu'une partie des territoires
+        # (les DROM pour l'INSEE) : les territoires absents sont ignorés
+        source = _load_source(args, None)
+        if 'Territoire' in source.columns:
+            available = set(source['Territoire'])
+            missing = [territoire for territoire in territories if territoire not in available]
+            if missing:
+                print(f"⚠️ Territoires absents de {args.source}, ignorés: {', '.join(missing)}")
+            territories = [territoire for territoire in territories if territoire in available]
+    
+    start = time.perf_counter()
+    if args.jobs > 1 and len(territories) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = [executor.submit(_run_territory, territoire, args) for territoire in territories]
+            results = [future.result() for future in futures]
+    else:
+        results = [_run_territory(territoire, args) for territoire in territories]
+    wall_time = time.perf_counter() - start
+    
+    print("\n⏱️ BILAN DES DURÉES (secondes)")
+    print("=" * 60)
+    print(f"{'Territoire':<26}{'Génération':>11}{'Export':>9}{'Rendu':>9}")
+    for territoire, timings in results:
+        print(f"{territoire:<26}{timings['generation']:>11.3f}{timings['export']:>9.3f}{timings['rendu']:>9.3f}")
+    print(f"\nTemps total: {wall_time:.2f} s pour {len(results)} territoires "
+          f"({max(1, min(args.jobs, len(territories)))} processus)")
+    
+    return results
+
+def _parse_args(argv=None):
+    """Analyse les arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Analyse démographique des DROM-COM")
+    parser.add_argument('--territories',
+                        help="'all' ou liste de territoires séparés par des virgules "
+                             "(sans cette option, le territoire est choisi de façon interactive)")
+    parser.add_argument('--jobs', type=int, default=1, help="nombre de processus en parallèle")
+    parser.add_argument('--no-plot', action='store_true', help="ne pas générer les graphiques")
+    parser.add_argument('--out-dir', default='.', help="dossier de sortie")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv', help="format des données exportées")
+    parser.add_argument('--compression', help="compression des données (ex. zstd, snappy ; csv et json : "
+                                              "gzip, bz2, zip, xz, zstd, suffixe ajouté au fichier)")
+    parser.add_argument('--float32', action='store_true', help="stocker les flottants en float32")
+    parser.add_argument('--partitioned', action='store_true',
+                        help="écrire les données par partitions Territoire=<nom> dans <out-dir>/demographic_data")
+    parser.add_argument('--append', action='store_true',
+                        help="ajouter des partitions à celles d'une exécution précédente (remplacées par défaut)")
+    parser.add_argument('--source', help="fichier officiel INSEE/ISEE (CSV ou Excel) à la place des données simulées")
+    parser.add_argument('--source-sep', default=';', help="séparateur de colonnes du CSV officiel")
+    parser.add_argument('--source-decimal', default=',', help="séparateur décimal du CSV officiel")
+    parser.add_argument('--source-sheet', help="feuille du classeur officiel (nom ou numéro, la première par défaut)")
+    parser.add_argument('--insights-json', action='store_true',
+                        help="écrire les insights de chaque territoire dans <territoire>_insights.json")
+    parser.add_argument('--trace', action='store_true',
+                        help="mesurer chaque étape et écrire <territoire>_trace.json")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="ajouter à la trace le pic mémoire de chaque étape (tracemalloc, ralentit l'exécution)")
+    parser.add_argument('--profile-stage', action='append', default=[], metavar='ETAPE',
+                        help="profiler une étape avec cProfile (simulation, evenements, mise_en_page, ...)")
+    parser.add_argument('--freq', choices=list(FREQUENCIES), default='Y',
+                        help="résolution des séries : annuelle, trimestrielle ou mensuelle (sans graphique)")
+    parser.add_argument('--batch-size', type=int,
+                        help="générer et écrire les données par blocs de N années (partitions, sans graphique)")
+    parser.add_argument('--plot-format', choices=RENDER_FORMATS, default='png', help="format des graphiques")
+    parser.add_argument('--dpi', type=int, default=300, help="résolution des graphiques")
+    parser.add_argument('--seed', type=int, help="graine aléatoire (active le cache des résultats)")
+    parser.add_argument('--model', choices=PROJECTION_MODELS, default='tendance',
+                        help="modèle de projection (cohortes : projection par composantes par âge)")
+    parser.add_argument('--start-year', type=int, default=2002)
+    parser.add_argument('--end-year', type=int, default=2025)
+    parser.add_argument('--check-import-time', action='store_true',
+                        help="vérifier le budget du temps d'import (sans matplotlib) et quitter")
+    parser.add_argument('--check-cohorts', action='store_true',
+                        help="vérifier l'équation démographique du modèle par cohortes et quitter")
+    
+    args = parser.parse_args(argv)
+    if args.source is not None and args.batch_size is not None:
+        parser.error("--source et --batch-size sont incompatibles")
+    if (args.compression is not None and args.format not in COLUMNAR_FORMATS and
+            (args.format not in ('csv', 'json') or args.compression not in TEXT_COMPRESSIONS)):
+        parser.error(f"--compression {args.compression} non prise en charge pour le format {args.format}")
+    if args.freq != 'Y' and not args.no_plot:
+        parser.error("--freq Q|M nécessite --no-plot (le tableau de bord est annuel)")
+    if args.batch_size is not None:
+        if args.freq != 'Y':
+            parser.error("--batch-size ne s'applique qu'aux séries annuelles")
+        if args.batch_size < 1:
+            parser.error("--batch-size doit être un entier positif")
+        if not args.no_plot:
+            parser.error("--batch-size nécessite --no-plot (les graphiques utilisent la série complète)")
+    if args.territories is not None:
+        if args.territories == 'all':
+            args.territories = list(TERRITOIRES)
+        else:
+            args.territories = [name.strip() for name in args.territories.split(',')]
+            unknown = [name for name in args.territories if name not in TERRITOIRES]
+            if unknown:
+                parser.error(f"territoires inconnus: {', '.join(unknown)} "
+                             f"(disponibles: {', '.join(TERRITOIRES)})")
+    
+    return args
+
+def main(argv=None):
+    """Fonction principale pour les DROM-COM"""
+    args = _parse_args(argv)
+    
+    if args.check_import_time:
+        result = check_import_budget()
+        status = "✅" if result['ok'] else "❌"
+        print(f"{status} Import du module: {result['seconds']:.3f} s (budget {result['budget']:.2f} s), "
+              f"matplotlib chargé: {'oui' if result['matplotlib_loaded'] else 'non'}")
+        sys.exit(0 if result['ok'] else 1)
+    
+    if args.check_cohorts:
+        result = check_cohort_accounting(seed=args.seed or 0)
+        print(f"{'✅' if result['ok'] else '❌'} Modèle par cohortes: {result['territoires']} territoires, "
+              f"{len(result['echecs'])} en échec")
+        for territoire, failure in result['echecs'].items():
+            print(f"• {territoire}: {failure}")
+        sys.exit(0 if result['ok'] else 1)
+    
+    # Mode batch : aucun choix interactif
+    if args.territories is not None:
+        run_batch(args.territories, args)
+        return
+    
+    territoires = TERRITOIRES
+    
+    print(f"🏝️ ANALYSE DÉMOGRAPHIQUE DES DROM-COM ({args.start_year}-{args.end_year})")
     print("=" * 60)
     
     # Demander à l'utilisateur de choisir un territoire
@@ -839,27 +2760,38 @@ def main():
         territoire_selectionne = "La Réunion"
     
     # Initialiser l'analyseur
-    analyzer = DromcomDemographyAnalyzer(territoire_selectionne)
+    analyzer = DromcomDemographyAnalyzer(territoire_selectionne, args.start_year, args.end_year,
+                                         args.seed, args.model)
     
-    # Générer les données
-    demographic_data = analyzer.generate_demographic_data()
+    # Générer les données (ou charger les séries officielles)
+    if args.source:
+        demographic_data = _load_source(args, territoire_selectionne)
+        analyzer.start_year, analyzer.end_year = (int(demographic_data['Annee'].min()),
+                                                  int(demographic_data['Annee'].max()))
+    else:
+        demographic_data = analyzer.generate_demographic_data(use_cache=True, freq=args.freq)
     
     # Sauvegarder les données
-    output_file = f'{territoire_selectionne}_demographic_data_2002_2025.csv'
-    demographic_data.to_csv(output_file, index=False)
+    os.makedirs(args.out_dir, exist_ok=True)
+    output_file = analyzer.export_data(demographic_data, args.out_dir, args.format,
+                                       args.compression, args.float32)
     print(f"💾 Données sauvegardées: {output_file}")
     
     # Aperçu des données
     print("\n👀 Aperçu des données:")
-    print(demographic_data[['Annee', 'Population', 'Taux_Natalite', 'Taux_Mortalite', 'IDH']].head())
+    preview = [col for col in ['Annee', 'Population', 'Taux_Natalite', 'Taux_Mortalite', 'IDH']
+               if col in demographic_data.columns]
+    print(demographic_data[preview].head())
     
     # Créer l'analyse
-    print("\n📈 Création de l'analyse démographique...")
-    analyzer.create_demographic_analysis(demographic_data)
+    if not args.no_plot:
+        print("\n📈 Création de l'analyse démographique...")
+        analyzer.create_demographic_analysis(demographic_data, output_dir=args.out_dir,
+                                             dpi=args.dpi, fmt=args.plot_format)
     
     print(f"\n✅ Analyse démographique de {territoire_selectionne} terminée!")
     print(f"📊 Période: {analyzer.start_year}-{analyzer.end_year}")
     print("📦 Données: Démographie, natalité, mortalité, IDH, économie")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()